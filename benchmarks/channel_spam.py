@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+
+import musicbot.music_commands as mc
+import musicbot.outbox as mo
+import musicbot.utils as mu
+from benchmarks.fakes import FakeContext, FakeTextChannel, FakeVoice, make_bot
+from musicbot import MusicBot
+
+COMMAND_INTERVAL_SECOND = 0.05
+SETTLE_POLLS = 2000
+
+
+async def direct_sends(
+    commands: int,
+    messages_per_window: int,
+    window_second: float,
+) -> None:
+    channel = FakeTextChannel(1, messages_per_window, window_second)
+    ctx = FakeContext(1, FakeVoice(), channel)
+
+    async def send(round_number: int) -> None:
+        await asyncio.sleep(round_number * COMMAND_INTERVAL_SECOND)
+        await ctx.send(embed=mu.make_embed(ctx=ctx, title="🔀 Queue shuffled"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send(round_number) for round_number in range(commands)))
+
+    sys.stdout.write(
+        f"direct: {commands} commands, {channel.stats['send']} sends, "
+        f"{channel.stats['rate_limited']} 429s, "
+        f"settled in {time.perf_counter() - started:.2f}s\n",
+    )
+
+
+async def outbox_sends(
+    bot: MusicBot,
+    commands: int,
+    messages_per_window: int,
+    window_second: float,
+) -> None:
+    channel = FakeTextChannel(2, messages_per_window, window_second)
+    cog = mc.MusicCommands(bot)
+    max_queued = 0
+
+    started = time.perf_counter()
+    for round_number in range(commands):
+        ctx = FakeContext(2, FakeVoice(), channel)
+        command = cog.shuffle if round_number % 2 else cog.loop
+        await command.callback(cog, ctx)
+        max_queued = max(max_queued, bot.outbox.queued)
+        await asyncio.sleep(COMMAND_INTERVAL_SECOND)
+
+    response_started = time.perf_counter()
+    await cog.info.callback(cog, FakeContext(2, FakeVoice(), channel))
+    response_second = time.perf_counter() - response_started
+
+    for _ in range(SETTLE_POLLS):
+        if not bot.outbox.queued:
+            break
+        await asyncio.sleep(COMMAND_INTERVAL_SECOND)
+    settled_second = time.perf_counter() - started
+
+    outbox_channel = bot.outbox.channels.get(channel.id)
+    if outbox_channel is not None and outbox_channel.worker is not None:
+        await outbox_channel.worker
+
+    if channel.id in bot.outbox.channels:
+        error_msg = "Idle channel was kept after its status message expired"
+        raise AssertionError(error_msg)
+
+    sys.stdout.write(
+        f"outbox: {commands} commands, {channel.stats['send']} sends and "
+        f"{channel.stats['edit']} edits, {channel.stats['rate_limited']} 429s, "
+        f"settled in {settled_second:.2f}s\n"
+        f"max queued: {max_queued}, reply behind spam: "
+        f"{response_second * 1e3:.1f} ms\n"
+        f"outbox stats: {dict(bot.outbox.stats)}\n",
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    mo.STATUS_REUSE_SECOND = args.status_reuse_second
+    await direct_sends(args.commands, args.messages_per_window, args.window_second)
+
+    with tempfile.TemporaryDirectory() as directory:
+        async with make_bot(directory) as bot:
+            bot.outbox.start()
+            await outbox_sends(
+                bot,
+                args.commands,
+                args.messages_per_window,
+                args.window_second,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Spam commands into one rate limited text channel",
+    )
+    parser.add_argument("--commands", type=int, default=40)
+    parser.add_argument("--messages-per-window", type=int, default=5)
+    parser.add_argument("--window-second", type=float, default=2.0)
+    parser.add_argument("--status-reuse-second", type=float, default=3.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
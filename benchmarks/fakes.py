@@ -0,0 +1,337 @@
+import asyncio
+import functools
+import itertools
+import logging
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from http.client import HTTPMessage
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest import mock
+from urllib.error import HTTPError
+
+import discord
+
+import musicbot.gapless as mgl
+import musicbot.guild_player as mgp
+import musicbot.metadata as mm
+import musicbot.queue_entry as mq
+from musicbot import BotConfig, MusicBot
+from musicbot.queue_entry import QueueEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterator
+
+TRACK_SECOND = 0.02
+SEARCH_RESULT_COUNT = 5
+IDLE_WAIT_POLLS = 500
+TOO_MANY_REQUESTS = 429
+UPSTREAM_URL = "https://www.youtube.com"
+RATE_LIMIT_WINDOW_SECOND = 5.0
+
+http_logger = logging.getLogger("discord.http")
+message_ids = itertools.count(1)
+
+upstream_calls = Counter[str]()
+
+
+@dataclass(frozen=True, slots=True)
+class Backend:
+    lookup_second: float = 0.0
+    stream_second: float = 0.0
+    ffmpeg_second: float = 0.0
+    playlist_size: int = 200
+    throttled_calls: int = 0
+
+
+def make_bot(directory: str, **overrides: object) -> MusicBot:
+    options = {
+        "prefix": "!",
+        "metadata_path": str(Path(directory) / "metadata.sqlite3"),
+        "session_path": str(Path(directory) / "sessions.sqlite3"),
+    }
+    return MusicBot(BotConfig(**(options | overrides)))
+
+
+def make_entry(index: int) -> QueueEntry:
+    return entry_for(f"{index:011d}")
+
+
+def entry_for(video_id: str) -> QueueEntry:
+    return QueueEntry(
+        video_id=video_id,
+        title=f"Song {video_id}",
+        author="Artist",
+        length=0,
+        thumbnail_url=f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+        channel_url="https://www.youtube.com/channel/UCartist",
+    )
+
+
+def query_video_id(query: str, rank: int = 0) -> str:
+    return f"{zlib.crc32(f'{rank}:{query}'.encode()):011d}"
+
+
+def call_upstream(backend: Backend, kind: str, delay_second: float) -> None:
+    upstream_calls[kind] += 1
+    if upstream_calls.total() <= backend.throttled_calls:
+        error_msg = "Too Many Requests"
+        raise HTTPError(
+            UPSTREAM_URL,
+            TOO_MANY_REQUESTS,
+            error_msg,
+            HTTPMessage(),
+            None,
+        )
+
+    time.sleep(delay_second)
+
+
+async def wait_idle(player: mgp.GuildPlayer) -> None:
+    for _ in range(IDLE_WAIT_POLLS):
+        if player.state is mgp.PlayerState.IDLE:
+            return
+        await asyncio.sleep(TRACK_SECOND)
+
+    error_msg = "Player never went idle"
+    raise AssertionError(error_msg)
+
+
+class FakeStreams:
+    def __init__(self, backend: Backend, video_id: str) -> None:
+        self.backend = backend
+        self.video_id = video_id
+
+    def get_audio_only(self, subtype: str) -> SimpleNamespace:
+        call_upstream(self.backend, "stream", self.backend.stream_second)
+        return SimpleNamespace(
+            url=f"https://media.invalid/{self.video_id}.{subtype}",
+        )
+
+
+class FakeYouTube:
+    def __init__(self, backend: Backend, url: str, _: str | None = None) -> None:
+        call_upstream(backend, "video", backend.lookup_second)
+
+        entry = entry_for(url.rsplit("=", 1)[-1])
+        self.video_id = entry.video_id
+        self.title = entry.title
+        self.author = entry.author
+        self.length = entry.length
+        self.thumbnail_url = entry.thumbnail_url
+        self.channel_url = entry.channel_url
+        self.streams = FakeStreams(backend, entry.video_id)
+
+
+class FakeSearch:
+    def __init__(self, backend: Backend, query: str) -> None:
+        call_upstream(backend, "search", backend.lookup_second)
+
+        self.videos = [
+            entry_for(query_video_id(query, rank))
+            for rank in range(SEARCH_RESULT_COUNT)
+        ]
+        self.entries: dict[str, QueueEntry] = {}
+
+    def fetch_and_parse(self) -> None:
+        self.entries = {video.video_id: video for video in self.videos}
+
+
+class FakePlaylist:
+    def __init__(self, backend: Backend, playlist_id: str) -> None:
+        call_upstream(backend, "playlist", backend.lookup_second)
+
+        self.backend = backend
+        self.title = f"Playlist {playlist_id}"
+        self.length = backend.playlist_size
+        self.thumbnail_url = f"https://i.ytimg.com/pl/{playlist_id}.jpg"
+        self.entries: dict[str, QueueEntry] = {}
+
+    def url_generator(self) -> Iterator[str]:
+        for index in range(self.length):
+            if index % mm.PLAYLIST_PAGE_SIZE == 0:
+                call_upstream(self.backend, "playlist_page", self.backend.lookup_second)
+
+            entry = make_entry(index)
+            self.entries[entry.video_id] = entry
+            yield f"https://www.youtube.com/watch?v={entry.video_id}"
+
+
+class FakeAudio:
+    def __init__(self, backend: Backend, source: str, **_: object) -> None:
+        time.sleep(backend.ffmpeg_second)
+        self.video_id = source.rsplit("/", 1)[-1].split(".", 1)[0]
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self) -> None:
+        pass
+
+
+@contextmanager
+def install(backend: Backend) -> Generator[None]:
+    fakes: tuple[tuple[object, str, Callable[..., object]], ...] = (
+        (mm, "YouTube", FakeYouTube),
+        (mm, "Search", FakeSearch),
+        (mm, "MetadataSearch", FakeSearch),
+        (mm, "MetadataPlaylist", FakePlaylist),
+        (mq, "YouTube", FakeYouTube),
+        (discord, "FFmpegOpusAudio", FakeAudio),
+    )
+
+    with ExitStack() as stack:
+        for target, name, fake in fakes:
+            stack.enter_context(
+                mock.patch.object(target, name, functools.partial(fake, backend)),
+            )
+        yield
+
+
+class FakeChannel:
+    def __init__(self, voice: FakeVoice) -> None:
+        self.voice = voice
+        self.bitrate = 64_000
+
+    async def connect(self) -> FakeVoice:
+        return self.voice
+
+
+class FakeVoice:
+    def __init__(self, track_second: float = TRACK_SECOND) -> None:
+        self.track_second = track_second
+        self.channel = FakeChannel(self)
+        self.lock = threading.Lock()
+        self.played: list[str] = []
+        self.gaps: list[float] = []
+        self.errors = 0
+        self.ended_at: float | None = None
+        self.stopped: threading.Event | None = None
+
+    def is_connected(self) -> bool:
+        return True
+
+    def is_playing(self) -> bool:
+        return self.stopped is not None
+
+    def play(self, source: mgl.TrackChain, after: Callable[[None], None]) -> None:
+        with self.lock:
+            if self.stopped is not None:
+                self.errors += 1
+                return
+
+            if self.ended_at is not None:
+                self.gaps.append(time.perf_counter() - self.ended_at)
+                self.ended_at = None
+
+            self.stopped = stopped = threading.Event()
+            self.played.append(source.song.video_id)
+
+        def run() -> None:
+            stopped.wait(self.track_second)
+            with self.lock:
+                if self.stopped is stopped:
+                    self.stopped = None
+                self.ended_at = time.perf_counter()
+            after(None)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stop(self) -> None:
+        with self.lock:
+            stopped, self.stopped = self.stopped, None
+        if stopped:
+            stopped.set()
+
+    def pause(self) -> None:
+        pass
+
+    def resume(self) -> None:
+        pass
+
+    async def disconnect(self, *, force: bool) -> None:
+        pass
+
+
+class FakeTextChannel:
+    def __init__(
+        self,
+        channel_id: int,
+        messages_per_window: int | None = None,
+        window_second: float = RATE_LIMIT_WINDOW_SECOND,
+    ) -> None:
+        self.id = channel_id
+        self.messages_per_window = messages_per_window
+        self.window_second = window_second
+        self.last_message_id: int | None = None
+        self.lock = asyncio.Lock()
+        self.requests: list[float] = []
+        self.stats = Counter[str]()
+
+    def next_message_id(self) -> int:
+        self.last_message_id = next(message_ids)
+        return self.last_message_id
+
+    async def request(self, kind: str) -> None:
+        self.stats[kind] += 1
+        if self.messages_per_window is None:
+            return
+
+        async with self.lock:
+            now = time.monotonic()
+            self.requests = [
+                at for at in self.requests if now - at < self.window_second
+            ]
+            if len(self.requests) >= self.messages_per_window:
+                retry_after = self.requests[0] + self.window_second - now
+                self.stats["rate_limited"] += 1
+                http_logger.warning(
+                    "We are being rate limited. %s responded with 429. "
+                    "Retrying in %.2f seconds.",
+                    kind,
+                    retry_after,
+                )
+                await asyncio.sleep(retry_after)
+            self.requests.append(time.monotonic())
+
+
+class FakeMessage:
+    def __init__(self, channel: FakeTextChannel) -> None:
+        self.channel = channel
+        self.id = channel.next_message_id()
+
+    async def edit(self, **_: object) -> None:
+        await self.channel.request("edit")
+
+
+class FakeContext:
+    def __init__(
+        self,
+        guild_id: int,
+        voice: FakeVoice,
+        channel: FakeTextChannel | None = None,
+    ) -> None:
+        self.voice_client = voice
+        self.guild = SimpleNamespace(id=guild_id, voice_client=voice)
+        self.author = SimpleNamespace(
+            display_name="Listener",
+            avatar=None,
+            voice=SimpleNamespace(channel=voice.channel),
+        )
+        self.channel = channel or FakeTextChannel(guild_id)
+        self.message = SimpleNamespace(id=self.channel.next_message_id())
+        self.interaction = None
+        self.sent = 0
+
+    async def defer(self) -> None:
+        pass
+
+    async def send(self, **_: object) -> FakeMessage:
+        self.sent += 1
+        await self.channel.request("send")
+        return FakeMessage(self.channel)
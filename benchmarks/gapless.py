@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+import musicbot.guild_player as mgp
+from benchmarks.fakes import make_bot
+from benchmarks.stream_expiry import make_tone
+from musicbot import MusicBot
+from musicbot.queue_entry import QueueEntry
+from musicbot.streams import AudioStream
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import discord
+
+FRAME_SECOND = 0.02
+STALL_SECOND = 2 * FRAME_SECOND
+RESOLVE_SECOND = 0.05
+
+
+class GapReader:
+    def __init__(self) -> None:
+        self.channel = SimpleNamespace(bitrate=64_000)
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.sources = 0
+        self.last_frame_at: float | None = None
+        self.stalls: list[float] = []
+        self.stopped = threading.Event()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def is_playing(self) -> bool:
+        return not self.stopped.is_set()
+
+    def play(
+        self,
+        source: discord.AudioSource,
+        after: Callable[[Exception | None], None],
+    ) -> None:
+        self.sources += 1
+        self.stopped.clear()
+
+        def run() -> None:
+            started = time.perf_counter()
+            frames = 0
+
+            while not self.stopped.is_set() and source.read():
+                self.record_frame()
+                frames += 1
+                delay = started + frames * FRAME_SECOND - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            source.cleanup()
+            after(None)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def record_frame(self) -> None:
+        now = time.perf_counter()
+        with self.lock:
+            if (
+                self.last_frame_at is not None
+                and (interval := now - self.last_frame_at) > STALL_SECOND
+            ):
+                self.stalls.append(interval - FRAME_SECOND)
+            self.last_frame_at = now
+            self.frames += 1
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def pause(self) -> None:
+        pass
+
+    def resume(self) -> None:
+        pass
+
+
+async def play_queue(
+    audio_url: str,
+    directory: str,
+    args: argparse.Namespace,
+    *,
+    preload_second: float,
+    crossfade_second: float = 0.0,
+) -> tuple[GapReader, MusicBot]:
+    async with make_bot(directory) as bot:
+        bot.streams.lookahead = 0
+        bot.playback.preloader.preload_second = preload_second
+        bot.playback.start()
+
+        async def get_stream(_: int, song: QueueEntry) -> AudioStream:
+            await asyncio.sleep(RESOLVE_SECOND)
+            return AudioStream(
+                url=f"{audio_url}/tone.ogg?song={song.video_id}",
+                codec="copy",
+                expires_at=time.monotonic() + 60,
+            )
+
+        bot.streams.get = get_stream
+
+        voice = GapReader()
+        player = bot.players.get(1)
+        player.crossfade_second = crossfade_second
+        player.queue.extend(
+            QueueEntry(
+                video_id=f"tone{index}",
+                title=f"Tone {index}",
+                author="ffmpeg",
+                length=args.length,
+                thumbnail_url="",
+                channel_url="",
+            )
+            for index in range(args.tracks)
+        )
+
+        await bot.playback.start_playing(1, voice)
+        for _ in range(args.tracks * args.length * 20):
+            if player.state is mgp.PlayerState.IDLE:
+                break
+            await asyncio.sleep(0.1)
+
+        bot.playback.close()
+
+    return voice, bot
+
+
+def report(name: str, voice: GapReader, bot: MusicBot) -> None:
+    gaps = bot.metrics.histograms["musicbot_transition_gap_seconds"].get(())
+    observed = sum(gaps.buckets) if gaps else 0
+    mean_gap = gaps.total / observed if gaps and observed else 0.0
+
+    sys.stdout.write(
+        f"{name}: {voice.frames * FRAME_SECOND:.1f}s played from "
+        f"{voice.sources} voice.play calls\n"
+        f"  stalls over {STALL_SECOND * 1e3:.0f} ms: {len(voice.stalls)}, "
+        f"worst {max(voice.stalls, default=0.0) * 1e3:.1f} ms, "
+        f"total {sum(voice.stalls) * 1e3:.1f} ms\n"
+        f"  transition gap metric: {observed} transitions, "
+        f"mean {mean_gap * 1e3:.2f} ms\n"
+        f"  playback stats: {dict(bot.playback.stats)}\n",
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        audio_path = Path(directory) / "tone.ogg"
+        await make_tone(audio_path, args.length)
+
+        app = web.Application()
+        app.router.add_static("/audio", directory)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        sock = socket.create_server(("127.0.0.1", 0))
+        audio_url = f"http://127.0.0.1:{sock.getsockname()[1]}/audio"
+        await web.SockSite(runner, sock).start()
+
+        legacy, legacy_bot = await play_queue(
+            audio_url,
+            directory,
+            args,
+            preload_second=0,
+        )
+        report("one source per song", legacy, legacy_bot)
+
+        gapless, gapless_bot = await play_queue(
+            audio_url,
+            directory,
+            args,
+            preload_second=args.preload,
+        )
+        report("preloaded next song", gapless, gapless_bot)
+
+        faded, faded_bot = await play_queue(
+            audio_url,
+            directory,
+            args,
+            preload_second=args.preload,
+            crossfade_second=args.crossfade,
+        )
+        report(f"{args.crossfade:g}s crossfade", faded, faded_bot)
+
+        await runner.cleanup()
+
+    if gapless.sources != 1 or faded.sources != 1:
+        error_msg = "Preloaded songs were not chained into one voice source"
+        raise AssertionError(error_msg)
+
+    if max(gapless.stalls, default=0.0) >= max(legacy.stalls, default=0.0):
+        error_msg = "Preloading did not shorten the worst transition"
+        raise AssertionError(error_msg)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure silence between songs with and without preloading",
+    )
+    parser.add_argument("--tracks", type=int, default=4)
+    parser.add_argument("--length", type=int, default=3)
+    parser.add_argument("--preload", type=float, default=1.5)
+    parser.add_argument("--crossfade", type=float, default=1.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
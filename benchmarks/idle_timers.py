@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from musicbot.deadlines import DeadlineScheduler
+
+PROBE_INTERVAL_SECOND = 0.001
+
+
+class TaskTimers:
+    def __init__(self) -> None:
+        self.tasks: dict[int, asyncio.Task[None]] = {}
+
+    def schedule(self, key: int, delay_second: float) -> None:
+        if (task := self.tasks.get(key)) and not task.done():
+            task.cancel()
+        self.tasks[key] = asyncio.create_task(asyncio.sleep(delay_second))
+
+    def close(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+
+
+async def probe_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL_SECOND)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL_SECOND)
+
+
+async def measure(
+    timers: TaskTimers | DeadlineScheduler,
+    guilds: int,
+    rounds: int,
+    settle_second: float,
+) -> tuple[float, int, list[float]]:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    probe = asyncio.create_task(probe_lag(stop, lags))
+
+    started = time.perf_counter()
+    for round_number in range(rounds):
+        for guild_id in range(guilds):
+            timers.schedule(guild_id, 300 + round_number)
+        await asyncio.sleep(0)
+    schedule_time = time.perf_counter() - started
+
+    await asyncio.sleep(settle_second)
+    task_count = len(asyncio.all_tasks())
+
+    stop.set()
+    await probe
+    timers.close()
+    return schedule_time, task_count, lags
+
+
+async def no_op(_: int) -> None:
+    pass
+
+
+async def run(args: argparse.Namespace) -> None:
+    scheduler = DeadlineScheduler(no_op)
+    scheduler.start()
+
+    results = {
+        "task per guild": await measure(
+            TaskTimers(),
+            args.guilds,
+            args.rounds,
+            args.settle,
+        ),
+        "deadline heap": await measure(
+            scheduler,
+            args.guilds,
+            args.rounds,
+            args.settle,
+        ),
+    }
+
+    sys.stdout.write(f"guilds: {args.guilds}, re-arm rounds: {args.rounds}\n")
+    for name, (schedule_time, task_count, lags) in results.items():
+        sys.stdout.write(
+            f"{name:>15}: {schedule_time / args.rounds * 1e3:8.2f} ms/round, "
+            f"{task_count:6d} tasks, loop lag mean "
+            f"{statistics.fmean(lags) * 1e3:6.3f} ms, "
+            f"max {max(lags) * 1e3:6.3f} ms\n",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare one idle task per guild against a single deadline heap",
+    )
+    parser.add_argument("--guilds", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--settle", type=float, default=0.5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
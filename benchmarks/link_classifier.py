@@ -0,0 +1,162 @@
+import argparse
+import functools
+import re
+import sys
+import timeit
+
+from musicbot.links import classify_link
+
+REFERENCE_SPOTIFY_REGEX = re.compile(
+    r"https?:\/\/open\.spotify\.com\/(?:intl-[\w-]+\/)?"
+    r"(?P<spotify_type>track|album|playlist)\/(?P<spotify_id>[A-Za-z0-9]{22})(\?.*)?",
+)
+
+REFERENCE_PLAYLIST_REGEX = re.compile(
+    r"(?:http?s?://)?(?:www\.|m\.)?(?:music.)?youtu\.?be(?:\.com)?"
+    r"(?:\w*.?://)?\w*.?\w*-?.?\w*(?:playlist|list|embed|.*/)?\??"
+    r"(?:feature=\w*\.?\w*)?&?(?:list=|/)(?P<playlist_id>[\w-]{34,})(?:\S+)?",
+)
+
+REFERENCE_WATCH_REGEX = re.compile(
+    r"(?:http?s?://)?(?:www\.|m\.)?(?:music.)?youtu\.?be(?:\.com)?"
+    r"(?:\w*.?://)?\w*.?\w*-?.?\w*(?:embed|e|v|watch|shorts|.*/)?\??"
+    r"(?:feature=\w*\.?\w*)?&?(?:\?v=|/)(?P<youtube_id>[\w-]{11})(?:\S+)?",
+)
+
+VIDEO = "dQw4w9WgXcQ"
+PLAYLIST = f"PL{'a' * 32}"
+ALBUM_PLAYLIST = f"OLAK5uy_{'b' * 33}"
+SPOTIFY = "4uLU6hMCjMI75M1A2tKUQC"
+
+CORPUS = [
+    f"https://www.youtube.com/watch?v={VIDEO}",
+    f"http://www.youtube.com/watch?v={VIDEO}",
+    f"youtube.com/watch?v={VIDEO}",
+    f"www.youtube.com/watch?v={VIDEO}",
+    f"https://m.youtube.com/watch?v={VIDEO}",
+    f"https://music.youtube.com/watch?v={VIDEO}",
+    f"https://www.youtube.com/watch?v={VIDEO}&t=42s",
+    f"https://www.youtube.com/watch?v={VIDEO}#t=3",
+    f"https://www.youtube.com/watch?v={VIDEO}&list={PLAYLIST}",
+    f"https://www.youtube.com/watch?v={VIDEO}&list=RD{VIDEO}",
+    f"https://youtu.be/{VIDEO}",
+    f"https://youtu.be/{VIDEO}?si=abc",
+    f"https://youtu.be/{VIDEO}?t=30",
+    f"https://www.youtube.com/shorts/{VIDEO}",
+    f"https://www.youtube.com/embed/{VIDEO}",
+    f"https://www.youtube.com/live/{VIDEO}",
+    f"https://www.youtube.com/v/{VIDEO}",
+    f"https://www.youtube.com/playlist?list={PLAYLIST}",
+    f"https://music.youtube.com/playlist?list={PLAYLIST}",
+    f"https://www.youtube.com/playlist?list={ALBUM_PLAYLIST}",
+    f"https://www.youtube.com/embed/videoseries?list={PLAYLIST}",
+    f"https://open.spotify.com/track/{SPOTIFY}",
+    f"https://open.spotify.com/track/{SPOTIFY}?si=123",
+    f"https://open.spotify.com/intl-de/album/{SPOTIFY}",
+    f"https://open.spotify.com/playlist/{SPOTIFY}",
+    f"open.spotify.com/track/{SPOTIFY}",
+    f"https://open.spotify.com/artist/{SPOTIFY}",
+    "https://www.youtube.com/watch?v=short",
+    "https://www.youtube.com/@channel",
+    f"https://example.com/watch?v={VIDEO}",
+    f"https://youtube-nocookie.com/embed/{VIDEO}",
+    f"https://www.youtube.com/watch?v={VIDEO} remix",
+    VIDEO,
+    "never gonna give you up",
+    "youtube",
+    "",
+]
+
+CHANGED = {
+    f"https://www.youtube.com/watch?list={PLAYLIST}&v={VIDEO}": ("video", VIDEO),
+    f"https://youtu.be/{VIDEO}?list={PLAYLIST}": ("video", VIDEO),
+    f"https://www.youtube.com/watch?feature=share&v={VIDEO}": ("video", VIDEO),
+    f"https://YouTube.com/watch?v={VIDEO}": ("video", VIDEO),
+    f"https://www.youtube.com/watch?v={VIDEO}extra": None,
+    f"https://open.spotify.com/track/{SPOTIFY}/": ("track", SPOTIFY),
+}
+
+ADVERSARIAL = {
+    "search text": "youtube {}",
+    "long playlist id": "youtube.com/list={} x",
+    "slashes": "youtube.com/{}/ ",
+}
+
+
+def reference_classify(text: str) -> tuple[str, str] | None:
+    if playlist_match := REFERENCE_PLAYLIST_REGEX.fullmatch(text):
+        return "playlist", playlist_match.group("playlist_id")
+    if youtube_match := REFERENCE_WATCH_REGEX.fullmatch(text):
+        return "video", youtube_match.group("youtube_id")
+    if spotify_match := REFERENCE_SPOTIFY_REGEX.fullmatch(text):
+        return spotify_match.group("spotify_type"), spotify_match.group("spotify_id")
+    return None
+
+
+def classify(text: str) -> tuple[str, str] | None:
+    if (link := classify_link(text)) is None:
+        return None
+    kind = link.spotify_type or link.kind.name.removeprefix("YOUTUBE_").lower()
+    return kind, link.link_id
+
+
+def check_parity() -> None:
+    for text in CORPUS:
+        if (result := classify(text)) != reference_classify(text):
+            error_msg = f"Classified {text!r} as {result}"
+            raise AssertionError(error_msg)
+
+    for text, expected in CHANGED.items():
+        if (result := classify(text)) != expected:
+            error_msg = f"Classified {text!r} as {result}, expected {expected}"
+            raise AssertionError(error_msg)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the link classifier against the old URL regexes",
+    )
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[250, 500, 1000])
+    args = parser.parse_args()
+
+    check_parity()
+
+    inputs = [*CORPUS, *CHANGED]
+    reference_time = timeit.timeit(
+        lambda: [reference_classify(text) for text in inputs],
+        number=args.repeat,
+    )
+    classify_time = timeit.timeit(
+        lambda: [classify_link(text) for text in inputs],
+        number=args.repeat,
+    )
+    calls = args.repeat * len(inputs)
+
+    sys.stdout.write(
+        f"corpus: {len(CORPUS)} links, parity: ok, "
+        f"{len(CHANGED)} intentional differences\n"
+        f"regexes:    {reference_time / calls * 1e6:8.2f} us/link\n"
+        f"classifier: {classify_time / calls * 1e6:8.2f} us/link\n",
+    )
+
+    for name, template in ADVERSARIAL.items():
+        for length in args.lengths:
+            text = template.format("a" * length)
+            reference_time = timeit.timeit(
+                functools.partial(reference_classify, text),
+                number=1,
+            )
+            classify_time = timeit.timeit(
+                functools.partial(classify_link, text),
+                number=1,
+            )
+            sys.stdout.write(
+                f"{name:>16} {len(text):6} chars: "
+                f"regexes {reference_time * 1e3:10.3f} ms, "
+                f"classifier {classify_time * 1e3:7.3f} ms\n",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+
+import musicbot.lookups as mlk
+import musicbot.music_commands as mc
+from benchmarks.fakes import (
+    Backend,
+    FakeContext,
+    FakeVoice,
+    install,
+    make_bot,
+    upstream_calls,
+)
+
+TRACK_SECOND = 60 * 60
+
+
+async def burst(
+    cog: mc.MusicCommands,
+    guilds: int,
+    song: str,
+) -> tuple[float, dict[str, int]]:
+    upstream_calls.clear()
+    contexts = [
+        FakeContext(guild_id, FakeVoice(TRACK_SECOND))
+        for guild_id in range(1, guilds + 1)
+    ]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(cog.play.callback(cog, ctx, song=song) for ctx in contexts))
+    return time.perf_counter() - started, dict(upstream_calls)
+
+
+async def play_search(cog: mc.MusicCommands, song: str) -> tuple[float, bool]:
+    ctx = FakeContext(0, FakeVoice(TRACK_SECOND))
+    queue = cog.bot.players.get(0).queue
+    queued = len(queue)
+
+    started = time.perf_counter()
+    await cog.play.callback(cog, ctx, song=song)
+    return time.perf_counter() - started, len(queue) > queued
+
+
+async def throttled_searches(
+    cog: mc.MusicCommands,
+    searches: int,
+) -> tuple[float, int]:
+    upstream_calls.clear()
+    throttle = cog.bot.throttle
+    failed = 0
+
+    started = time.perf_counter()
+    for round_number in range(searches):
+        _, added = await play_search(cog, f"throttled song {round_number}")
+        failed += not added
+        await asyncio.sleep(max(throttle.blocked_until - time.monotonic(), 0.0))
+    return time.perf_counter() - started, failed
+
+
+async def searches_during_backoff(cog: mc.MusicCommands) -> None:
+    cog.bot.throttle.throttled()
+
+    cold_second, cold_added = await play_search(cog, "song nobody searched yet")
+    warm_second, warm_added = await play_search(cog, "throttled song 7")
+    sys.stdout.write(
+        f"during backoff: uncached search failed in {cold_second * 1e3:.1f} ms, "
+        f"cached search answered in {warm_second * 1e3:.1f} ms\n",
+    )
+
+    if cold_added or not warm_added:
+        error_msg = "Lookups during a backoff did not fail fast or skip the cache"
+        raise AssertionError(error_msg)
+
+
+async def run(args: argparse.Namespace) -> None:
+    mlk.MIN_BACKOFF_SECOND = args.min_backoff
+    backend = Backend(lookup_second=args.lookup_ms / 1e3)
+
+    with tempfile.TemporaryDirectory() as directory, install(backend):
+        async with make_bot(directory) as bot:
+            bot.streams.lookahead = 0
+            cog = mc.MusicCommands(bot)
+
+            for name, song in (
+                ("video link", "https://www.youtube.com/watch?v=burstvideo1"),
+                ("search", "Everyone Plays This Song"),
+                ("playlist", f"https://www.youtube.com/playlist?list=PL{'b' * 32}"),
+            ):
+                elapsed, calls = await burst(cog, args.guilds, song)
+                sys.stdout.write(
+                    f"{name:>10}: {args.guilds} guilds in {elapsed * 1e3:7.1f} ms, "
+                    f"upstream calls {calls}\n",
+                )
+
+            sys.stdout.write(f"lookups: {dict(bot.resolver.lookups.stats)}\n")
+
+            with install(
+                Backend(
+                    lookup_second=args.lookup_ms / 1e3,
+                    throttled_calls=args.throttled,
+                ),
+            ):
+                elapsed, failed = await throttled_searches(cog, args.searches)
+
+            sys.stdout.write(
+                f"throttled: {args.searches} searches, first {args.throttled} "
+                f"answered 429, {failed} failed, took {elapsed:.2f}s\n"
+                f"throttle: {dict(bot.throttle.stats)}, "
+                f"rate {bot.throttle.rate:.2f}/s\n",
+            )
+
+            if failed != args.throttled or not bot.throttle.stats["backoffs"]:
+                error_msg = "Throttled lookups did not back off"
+                raise AssertionError(error_msg)
+
+            await searches_during_backoff(cog)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Play the same song from many guilds at once",
+    )
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--lookup-ms", type=float, default=200.0)
+    parser.add_argument("--searches", type=int, default=8)
+    parser.add_argument("--throttled", type=int, default=3)
+    parser.add_argument("--min-backoff", type=float, default=0.1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
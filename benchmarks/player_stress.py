@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+from typing import TYPE_CHECKING
+
+import musicbot.guild_player as mgp
+from benchmarks.fakes import TRACK_SECOND, FakeVoice, make_bot, make_entry, wait_idle
+from musicbot import MusicBot
+
+if TYPE_CHECKING:
+    from musicbot.queue_entry import QueueEntry
+
+SKIP_RATIO = 0.5
+COMMANDS = ("skip", "jump", "clear", "add", "pause", "play", "loop")
+
+
+class FakeSource:
+    def __init__(self, song: QueueEntry) -> None:
+        self.video_id = song.video_id
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self) -> None:
+        pass
+
+
+async def skip_storm(bot: MusicBot, size: int, workers: int) -> FakeVoice:
+    voice = FakeVoice()
+    player = bot.players.get(1)
+    player.queue.extend(make_entry(index) for index in range(size))
+
+    async def worker(rng: random.Random) -> None:
+        while player.current or player.state is not mgp.PlayerState.IDLE:
+            if rng.random() < SKIP_RATIO:
+                await asyncio.to_thread(bot.playback.stop_source, player, voice)
+            else:
+                await bot.playback.start_playing(1, voice)
+            await asyncio.sleep(rng.random() * TRACK_SECOND)
+
+    await bot.playback.start_playing(1, voice)
+    await asyncio.gather(*(worker(random.Random(seed)) for seed in range(workers)))
+    await wait_idle(player)
+
+    expected = [make_entry(index).video_id for index in range(size)]
+    if voice.played != expected:
+        error_msg = "Songs were skipped or repeated while skipping concurrently"
+        raise AssertionError(error_msg)
+
+    return voice
+
+
+async def run_command(
+    bot: MusicBot,
+    player: mgp.GuildPlayer,
+    voice: FakeVoice,
+    rng: random.Random,
+) -> None:
+    match rng.choice(COMMANDS):
+        case "skip":
+            await asyncio.to_thread(bot.playback.stop_source, player, voice)
+        case "jump" if player.queue:
+            player.jump(rng.randrange(len(player.queue)))
+            await asyncio.to_thread(bot.playback.stop_source, player, voice)
+        case "clear":
+            player.clear()
+        case "add":
+            player.queue.append(make_entry(rng.randrange(1000)))
+            await bot.playback.start_playing(player.guild_id, voice)
+        case "pause":
+            player.pause()
+            player.resume()
+        case "play":
+            await bot.playback.start_playing(player.guild_id, voice)
+        case "loop":
+            player.loop_queue = not player.loop_queue
+
+
+async def command_storm(bot: MusicBot, commands: int, seed: int) -> FakeVoice:
+    rng = random.Random(seed)
+    voice = FakeVoice()
+    player = bot.players.get(2)
+    player.queue.extend(make_entry(index) for index in range(20))
+
+    async def delayed_command(delay: float) -> None:
+        await asyncio.sleep(delay)
+        await run_command(bot, player, voice, rng)
+
+        if not -1 <= player.index < max(len(player.queue), 1):
+            error_msg = f"Index {player.index} out of range"
+            raise AssertionError(error_msg)
+
+    spread_second = commands * TRACK_SECOND / 10
+    await asyncio.gather(
+        *(delayed_command(rng.random() * spread_second) for _ in range(commands)),
+    )
+
+    player.loop_queue = False
+    player.clear()
+    await asyncio.to_thread(bot.playback.stop_source, player, voice)
+    await wait_idle(player)
+
+    if voice.errors:
+        error_msg = f"{voice.errors} overlapping play calls"
+        raise AssertionError(error_msg)
+
+    return voice
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        async with make_bot(directory) as bot:
+            bot.streams.lookahead = 0
+
+            async def make_source(
+                _: mgp.GuildPlayer,
+                song: QueueEntry,
+                __: FakeVoice,
+                ___: float = 0.0,
+                **_options: bool,
+            ) -> FakeSource:
+                await asyncio.sleep(random.random() * TRACK_SECOND / 2)
+                return FakeSource(song)
+
+            bot.playback.make_source = make_source
+
+            skipped = await skip_storm(bot, args.size, args.workers)
+            mixed = await command_storm(bot, args.commands, args.seed)
+
+    sys.stdout.write(
+        f"skip storm: {len(skipped.played)} songs, {args.workers} workers, "
+        f"order preserved, {skipped.errors} overlapping plays\n"
+        f"command storm: {args.commands} commands, "
+        f"{len(mixed.played)} songs started, {mixed.errors} overlapping plays\n",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fire concurrent commands at a guild player",
+    )
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=31)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import sys
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from pytubefix import YouTube
+
+from musicbot.queue_entry import QueueEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+RELATED_VIDEO_COUNT = 20
+STREAM_FORMAT_COUNT = 30
+
+
+def make_vid_info(index: int) -> dict:
+    video_id = f"{index:011d}"
+    return {
+        "playabilityStatus": {"status": "OK"},
+        "videoDetails": {
+            "videoId": video_id,
+            "title": f"Song number {index} (Official Music Video)",
+            "author": f"Artist {index}",
+            "lengthSeconds": "215",
+            "channelId": f"UC{index:022d}",
+            "thumbnail": {
+                "thumbnails": [
+                    {"url": f"https://i.ytimg.com/vi/{video_id}/{size}.jpg"}
+                    for size in ("default", "mqdefault", "hqdefault", "maxresdefault")
+                ],
+            },
+            "shortDescription": "lyrics " * 200,
+            "keywords": [f"keyword {i}" for i in range(20)],
+        },
+        "streamingData": {
+            "adaptiveFormats": [
+                {
+                    "itag": itag,
+                    "url": f"https://rr1---sn.googlevideo.com/videoplayback?id={video_id}"
+                    f"&itag={itag}&expire=1700000000&sig={'x' * 400}",
+                    "mimeType": 'audio/webm; codecs="opus"',
+                    "bitrate": 160_000,
+                    "contentLength": "3500000",
+                }
+                for itag in range(STREAM_FORMAT_COUNT)
+            ],
+        },
+    }
+
+
+def make_vid_details(index: int) -> dict:
+    return {
+        "contents": {
+            "twoColumnWatchNextResults": {
+                "secondaryResults": [
+                    {
+                        "videoId": f"{index + related:011d}",
+                        "title": f"Related song {related}",
+                        "thumbnail": f"https://i.ytimg.com/vi/{related}/hq.jpg",
+                        "accessibility": "related video " * 30,
+                    }
+                    for related in range(RELATED_VIDEO_COUNT)
+                ],
+            },
+        },
+    }
+
+
+def make_youtube(index: int) -> YouTube:
+    song = YouTube(f"https://www.youtube.com/watch?v={index:011d}")
+    song.vid_info = make_vid_info(index)
+    song.vid_details = make_vid_details(index)
+    return song
+
+
+def make_entry(index: int) -> QueueEntry:
+    vid_info = make_vid_info(index)
+    details = vid_info["videoDetails"]
+    return QueueEntry(
+        video_id=details["videoId"],
+        title=details["title"],
+        author=details["author"],
+        length=int(details["lengthSeconds"]),
+        thumbnail_url=details["thumbnail"]["thumbnails"][-1]["url"],
+        channel_url=f"https://www.youtube.com/channel/{details['channelId']}",
+    )
+
+
+def measure(factory: Callable[[int], object], size: int) -> int:
+    tracemalloc.start()
+    queue = [factory(index) for index in range(size)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queue
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare resident memory of queue entry representations",
+    )
+    parser.add_argument("--size", type=int, default=500)
+    args = parser.parse_args()
+
+    youtube_bytes = measure(make_youtube, args.size)
+    entry_bytes = measure(make_entry, args.size)
+
+    sys.stdout.write(
+        f"songs: {args.size}\n"
+        f"YouTube:    {youtube_bytes / 2**20:10.2f} MiB "
+        f"({youtube_bytes // args.size} B/song)\n"
+        f"QueueEntry: {entry_bytes / 2**20:10.2f} MiB "
+        f"({entry_bytes // args.size} B/song)\n"
+        f"ratio:      {youtube_bytes / entry_bytes:10.1f}x\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import argparse
+import random
+import sys
+import timeit
+
+from musicbot.queue_entry import QueueEntry
+from musicbot.song_queue import SongQueue
+from musicbot.utils import time_format
+
+SHORT_TITLE_WORDS = 20
+LONG_TITLE_WORDS = 180
+POP_RATIO = 0.5
+
+
+def reference_get_queue_page(
+    queue: list,
+    current_index: int,
+    page_number: int | None = None,
+    max_items: int = 10,
+) -> tuple[int, int, str]:
+    embed_field_value_limit = 1024
+
+    lines = [
+        f"**{i})** [{s.title}]({s.watch_url}) `{time_format(s.length)}`"
+        for i, s in enumerate(queue, start=1)
+    ]
+
+    pages: list[list[str]] = []
+    current_page: list[str] = []
+    current_sum = 0
+
+    for line in lines:
+        line_length = len(line)
+        if (
+            len(current_page) >= max_items
+            or current_sum + line_length > embed_field_value_limit
+        ):
+            pages.append(current_page)
+            current_page = []
+            current_sum = 0
+
+        current_page.append(line)
+        current_sum += line_length
+
+    if current_page:
+        pages.append(current_page)
+
+    if page_number is None:
+        cur_page_number, cur_page = next(
+            (idx, page)
+            for idx, page in enumerate(pages, start=1)
+            if lines[current_index] in page
+        )
+    else:
+        cur_page_number = page_number
+        cur_page = pages[page_number - 1]
+
+    return cur_page_number, len(pages), "\n".join(cur_page)
+
+
+def make_entry(
+    rng: random.Random,
+    index: int,
+    max_words: int = SHORT_TITLE_WORDS,
+) -> QueueEntry:
+    return QueueEntry(
+        video_id=f"{index:011d}",
+        title="Song " * rng.randint(1, max_words) + str(index),
+        author=f"Artist {index}",
+        length=rng.randint(30, 4 * 60 * 60),
+        thumbnail_url="",
+        channel_url="",
+    )
+
+
+def check_parity(song_queue: SongQueue, reference: list[QueueEntry]) -> None:
+    _, len_pages, _ = reference_get_queue_page(reference, 0)
+    indexes = range(-len(reference), len(reference), max(len(reference) // 50, 1))
+
+    for current_index in indexes:
+        expected = reference_get_queue_page(reference, current_index)
+        if song_queue.get_page(current_index) != expected:
+            error_msg = f"Page mismatch at index {current_index}"
+            raise AssertionError(error_msg)
+
+    for page_number in range(-len_pages + 1, len_pages + 1):
+        expected = reference_get_queue_page(reference, 0, page_number)
+        if song_queue.get_page(0, page_number) != expected:
+            error_msg = f"Page mismatch on page {page_number}"
+            raise AssertionError(error_msg)
+
+
+def run_parity(size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    song_queue = SongQueue()
+    reference: list[QueueEntry] = []
+
+    for index in range(size):
+        entry = make_entry(rng, index)
+        song_queue.append(entry)
+        reference.append(entry)
+
+        if index % 97 == 0:
+            check_parity(song_queue, reference)
+
+    for _ in range(50):
+        first, second = rng.randrange(len(reference)), rng.randrange(len(reference))
+        reference.insert(second, reference.pop(first))
+        song_queue.insert(second, song_queue.pop(first))
+        check_parity(song_queue, reference)
+
+    song_queue.shuffle()
+    check_parity(song_queue, list(song_queue))
+
+
+def run_edit_parity(edits: int, seed: int) -> None:
+    rng = random.Random(seed)
+    song_queue = SongQueue()
+    reference: list[QueueEntry] = []
+
+    for index in range(edits):
+        if reference and rng.random() < POP_RATIO:
+            position = rng.randrange(len(reference))
+            reference.pop(position)
+            song_queue.pop(position)
+        else:
+            position = rng.randrange(len(reference) + 1)
+            entry = make_entry(rng, index, LONG_TITLE_WORDS)
+            reference.insert(position, entry)
+            song_queue.insert(position, entry)
+
+        if reference:
+            check_parity(song_queue, reference)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare queue page rendering against the full re-pagination",
+    )
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=31)
+    args = parser.parse_args()
+
+    run_parity(min(args.size, 1000), args.seed)
+    run_edit_parity(args.edits, args.seed)
+
+    rng = random.Random(args.seed)
+    entries = [make_entry(rng, index) for index in range(args.size)]
+    song_queue = SongQueue()
+    song_queue.extend(entries)
+    current_index = args.size // 2
+
+    reference_time = timeit.timeit(
+        lambda: reference_get_queue_page(entries, current_index),
+        number=args.repeat,
+    )
+    queue_time = timeit.timeit(
+        lambda: song_queue.get_page(current_index),
+        number=args.repeat,
+    )
+    mutated_time = timeit.timeit(
+        lambda: (
+            song_queue.insert(current_index, song_queue.pop(0)),
+            song_queue.get_page(current_index),
+        ),
+        number=args.repeat,
+    )
+
+    sys.stdout.write(
+        f"songs: {args.size}, parity: ok\n"
+        f"full re-pagination: {reference_time / args.repeat * 1e3:8.3f} ms/call\n"
+        f"SongQueue.get_page: {queue_time / args.repeat * 1e3:8.3f} ms/call\n"
+        f"after pop + insert: {mutated_time / args.repeat * 1e3:8.3f} ms/call\n",
+    )
+
+
+if __name__ == "__main__":
+    main()
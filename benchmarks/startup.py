@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.fakes import make_bot
+
+
+async def import_second(module: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            f"import {module}",
+        )
+        await process.wait()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+async def boot_second(directory: str, sync_second: float) -> tuple[float, int]:
+    syncs = 0
+
+    async def sync() -> list[object]:
+        nonlocal syncs
+        syncs += 1
+        await asyncio.sleep(sync_second)
+        return []
+
+    command_hash_path = str(Path(directory) / "commands.sha256")
+    async with make_bot(directory, command_hash_path=command_hash_path) as bot:
+        with mock.patch.object(bot.tree, "sync", sync):
+            started = time.perf_counter()
+            await bot.setup_hook()
+            return time.perf_counter() - started, syncs
+
+
+async def run(args: argparse.Namespace) -> None:
+    discord_second = await import_second("discord", args.repeat)
+    musicbot_second = await import_second("musicbot", args.repeat)
+
+    sys.stdout.write(
+        f"python -c 'import discord':  {discord_second * 1e3:7.1f} ms\n"
+        f"python -c 'import musicbot': {musicbot_second * 1e3:7.1f} ms\n",
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("first boot", "restart"):
+            elapsed, syncs = await boot_second(directory, args.sync_ms / 1e3)
+            sys.stdout.write(
+                f"{name:>10}: setup_hook {elapsed * 1e3:7.1f} ms, "
+                f"{syncs} command syncs\n",
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time imports and setup_hook on a first boot and a restart",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sync-ms", type=float, default=500.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
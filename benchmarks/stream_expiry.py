@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+import musicbot.guild_player as mgp
+import musicbot.playback as mpb
+from benchmarks.fakes import make_bot
+from musicbot.queue_entry import QueueEntry
+from musicbot.streams import AudioStream
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import discord
+
+FRAME_SECOND = 0.02
+RESOLVE_SECOND = 0.05
+EXPIRING_TOKEN = 1
+
+
+class FrameReader:
+    def __init__(self) -> None:
+        self.channel = SimpleNamespace(bitrate=64_000)
+        self.frames = 0
+        self.sources = 0
+        self.stopped = threading.Event()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def play(
+        self,
+        source: discord.AudioSource,
+        after: Callable[[Exception | None], None],
+    ) -> None:
+        self.sources += 1
+        self.stopped.clear()
+
+        def run() -> None:
+            started = time.perf_counter()
+            frames = 0
+
+            while not self.stopped.is_set() and source.read():
+                frames += 1
+                delay = started + frames * FRAME_SECOND - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            self.frames += frames
+            source.cleanup()
+            after(None)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+class ExpiringServer:
+    def __init__(self, audio_path: Path, cut_fraction: float) -> None:
+        self.audio = audio_path.read_bytes()
+        self.audio_path = audio_path
+        self.cut_bytes = int(len(self.audio) * cut_fraction)
+        self.requests = 0
+        self.rejected = 0
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+
+        if int(request.query["token"]) != EXPIRING_TOKEN:
+            return web.FileResponse(self.audio_path)
+
+        if request.headers.get("Range") or self.requests > 1:
+            self.rejected += 1
+            return web.Response(status=403)
+
+        response = web.StreamResponse(
+            headers={"Content-Length": str(len(self.audio))},
+        )
+        response.content_type = "audio/ogg"
+        await response.prepare(request)
+        await response.write(self.audio[: self.cut_bytes])
+        request.transport.close()
+        return response
+
+
+async def make_tone(path: Path, length: int) -> None:
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-loglevel",
+        "error",
+        "-f",
+        "lavfi",
+        "-i",
+        f"sine=frequency=440:duration={length}",
+        "-c:a",
+        "libopus",
+        "-f",
+        "ogg",
+        "-y",
+        str(path),
+    )
+
+    if await process.wait():
+        error_msg = "ffmpeg could not generate the test tone"
+        raise RuntimeError(error_msg)
+
+
+async def run(args: argparse.Namespace) -> None:
+    mpb.STREAM_END_TOLERANCE_SECOND = args.tolerance
+
+    with tempfile.TemporaryDirectory() as directory:
+        audio_path = Path(directory) / "tone.ogg"
+        await make_tone(audio_path, args.length)
+
+        server = ExpiringServer(audio_path, args.cut)
+        app = web.Application()
+        app.router.add_get("/audio", server.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        sock = socket.create_server(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        await web.SockSite(runner, sock).start()
+
+        async with make_bot(directory) as bot:
+            bot.streams.lookahead = 0
+            tokens = iter(range(EXPIRING_TOKEN, EXPIRING_TOKEN + 100))
+
+            async def get_stream(_: int, __: QueueEntry) -> AudioStream:
+                await asyncio.sleep(RESOLVE_SECOND)
+                return AudioStream(
+                    url=f"http://127.0.0.1:{port}/audio?token={next(tokens)}",
+                    codec="copy",
+                    expires_at=time.monotonic() + 60,
+                )
+
+            bot.streams.get = get_stream
+
+            voice = FrameReader()
+            player = bot.players.get(1)
+            player.queue.append(
+                QueueEntry(
+                    video_id="tone",
+                    title="Tone",
+                    author="ffmpeg",
+                    length=args.length,
+                    thumbnail_url="",
+                    channel_url="",
+                ),
+            )
+
+            started = time.perf_counter()
+            await bot.playback.start_playing(1, voice)
+            for _ in range(args.length * 20):
+                if player.state is mgp.PlayerState.IDLE:
+                    break
+                await asyncio.sleep(0.1)
+            elapsed = time.perf_counter() - started
+
+        await runner.cleanup()
+
+    played_second = voice.frames * FRAME_SECOND
+    sys.stdout.write(
+        f"track: {args.length}s, first URL cut at {args.cut:.0%} then 403\n"
+        f"played {played_second:.1f}s of audio from {voice.sources} sources "
+        f"in {elapsed:.1f}s, {server.rejected} requests rejected\n"
+        f"playback stats: {dict(bot.playback.stats)}\n",
+    )
+
+    if not bot.playback.stats["recoveries"]:
+        error_msg = "Early stream end was not recovered"
+        raise AssertionError(error_msg)
+
+    if played_second < args.length - args.tolerance:
+        error_msg = f"Only {played_second:.1f}s of {args.length}s were played"
+        raise AssertionError(error_msg)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cut a stream mid-song and check playback resumes from there",
+    )
+    parser.add_argument("--length", type=int, default=8)
+    parser.add_argument("--cut", type=float, default=0.4)
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import musicbot.music_commands as mc
+from benchmarks.fakes import (
+    Backend,
+    FakeContext,
+    FakeVoice,
+    install,
+    make_bot,
+    make_entry,
+    wait_idle,
+)
+from musicbot import MusicBot
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+IDLE_TRACK_SECOND = 60 * 60
+KEYSTROKE_SECOND = 0.08
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "median_ms": statistics.median(ordered) * 1e3,
+        "p95_ms": statistics.quantiles(ordered, n=20, method="inclusive")[-1] * 1e3,
+        "max_ms": ordered[-1] * 1e3,
+    }
+
+
+async def time_command(
+    command: Callable[[int], Awaitable[None]],
+    repeat: int,
+) -> dict[str, float]:
+    samples = []
+    for round_number in range(repeat):
+        started = time.perf_counter()
+        await command(round_number)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def make_commands(
+    cog: mc.MusicCommands,
+    ctx: FakeContext,
+    size: int,
+) -> dict[str, Callable[[int], Awaitable[None]]]:
+    async def play(round_number: int) -> None:
+        await cog.play.callback(cog, ctx, song=f"benchmark song {size} {round_number}")
+
+    async def queue(_: int) -> None:
+        await cog.queue.callback(cog, ctx)
+
+    async def move(_: int) -> None:
+        await cog.move.callback(cog, ctx, "1", new_position=str(size))
+
+    async def shuffle(_: int) -> None:
+        await cog.shuffle.callback(cog, ctx)
+
+    return {"play": play, "queue": queue, "move": move, "shuffle": shuffle}
+
+
+async def command_latency(
+    bot: MusicBot,
+    sizes: list[int],
+    repeat: int,
+) -> dict[str, dict[str, dict[str, float]]]:
+    cog = mc.MusicCommands(bot)
+    results: dict[str, dict[str, dict[str, float]]] = {}
+
+    for guild_id, size in enumerate(sizes, start=1):
+        voice = FakeVoice(IDLE_TRACK_SECOND)
+        ctx = FakeContext(guild_id, voice)
+        player = bot.players.get(guild_id)
+        player.queue.extend(make_entry(index) for index in range(size))
+        await bot.playback.start_playing(guild_id, voice)
+
+        for name, command in make_commands(cog, ctx, size).items():
+            results.setdefault(name, {})[str(size)] = await time_command(
+                command,
+                repeat,
+            )
+
+        player.clear()
+        bot.playback.stop_source(player, voice)
+        await wait_idle(player)
+
+    return results
+
+
+async def transition_latency(bot: MusicBot, tracks: int) -> dict[str, float]:
+    guild_id = 0
+    voice = FakeVoice()
+    player = bot.players.get(guild_id)
+    player.queue.extend(make_entry(index) for index in range(tracks))
+
+    await bot.playback.start_playing(guild_id, voice)
+    await wait_idle(player)
+
+    if voice.errors or len(voice.played) != tracks:
+        error_msg = f"Played {len(voice.played)} of {tracks} tracks"
+        raise AssertionError(error_msg)
+
+    return summarize(voice.gaps)
+
+
+async def autocomplete_latency(
+    bot: MusicBot,
+    titles: int,
+    repeat: int,
+) -> dict[str, object]:
+    for index in range(titles):
+        bot.metadata.index.add(
+            f"Artist {index % 500} - Track {index}",
+            make_entry(index),
+        )
+
+    local = []
+    for round_number in range(repeat):
+        prefix = f"artist {round_number % 500} - tr"
+        started = time.perf_counter()
+        await bot.suggestions.suggest(0, 0, prefix)
+        local.append(time.perf_counter() - started)
+
+    async def keystroke(user_id: int, text: str) -> float:
+        started = time.perf_counter()
+        await bot.suggestions.suggest(0, user_id, text)
+        return time.perf_counter() - started
+
+    keystrokes = []
+    for user_id, query in enumerate(
+        f"unheard song {round_number}" for round_number in range(repeat)
+    ):
+        for length in range(1, len(query) + 1):
+            keystrokes.append(asyncio.create_task(keystroke(user_id, query[:length])))
+            await asyncio.sleep(KEYSTROKE_SECOND)
+    typed = await asyncio.gather(*keystrokes)
+
+    return {
+        "indexed_keys": len(bot.metadata.index),
+        "local_prefix": summarize(local),
+        "typing": summarize(typed),
+        "answers": dict(bot.suggestions.stats),
+    }
+
+
+def memory_per_guild(bot: MusicBot, guilds: int, songs: int) -> dict[str, float]:
+    first_guild_id = 1_000_000
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for guild_id in range(first_guild_id, first_guild_id + guilds):
+        bot.players.get(guild_id).queue.extend(
+            make_entry(guild_id * songs + index) for index in range(songs)
+        )
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "guilds": guilds,
+        "songs_per_guild": songs,
+        "traced_bytes_per_guild": (after - before) / guilds,
+        "estimated_bytes_per_guild": bot.players.memory_usage() / len(bot.players),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, object]:
+    backend = Backend(
+        lookup_second=args.lookup_ms / 1e3,
+        stream_second=args.stream_ms / 1e3,
+        ffmpeg_second=args.ffmpeg_ms / 1e3,
+    )
+
+    with tempfile.TemporaryDirectory() as directory, install(backend):
+        async with make_bot(directory) as bot:
+            commands = await command_latency(bot, args.sizes, args.repeat)
+            transitions = await transition_latency(bot, args.tracks)
+            autocomplete = await autocomplete_latency(bot, args.titles, args.repeat)
+            memory = memory_per_guild(bot, args.guilds, args.songs)
+
+    return {
+        "python": platform.python_version(),
+        "backend": asdict(backend),
+        "commands": commands,
+        "transitions": transitions,
+        "autocomplete": autocomplete,
+        "memory": memory,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run offline command, playback and memory benchmarks",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--tracks", type=int, default=50)
+    parser.add_argument("--titles", type=int, default=50_000)
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--songs", type=int, default=20)
+    parser.add_argument("--lookup-ms", type=float, default=0.0)
+    parser.add_argument("--stream-ms", type=float, default=0.0)
+    parser.add_argument("--ffmpeg-ms", type=float, default=0.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = json.dumps(asyncio.run(run(args)), indent=2)
+
+    if args.output:
+        args.output.write_text(results + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(results + "\n")
+
+
+if __name__ == "__main__":
+    main()
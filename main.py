@@ -2,16 +2,20 @@ from os import environ
 
 from dotenv import load_dotenv
 
-from musicbot import MusicBot
+from musicbot import BotConfig, MusicBot, Supervisor
 
 
 def main() -> None:
     load_dotenv()
-    prefix = environ["BOT_PREFIX"]
     token = environ["BOT_TOKEN"]
 
-    bot = MusicBot(prefix)
-    bot.run(token)
+    config = BotConfig.from_env()
+
+    if config.process_count > 1:
+        Supervisor(config, token).run()
+    else:
+        bot = MusicBot(config)
+        bot.run(token)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
+from .config import BotConfig
 from .music_bot import MusicBot
+from .supervisor import Supervisor
 
-__all__ = ["MusicBot"]
+__all__ = ["BotConfig", "MusicBot", "Supervisor"]
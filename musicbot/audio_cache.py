@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .queue_entry import QueueEntry
+    from .streams import AudioStream
+
+MAX_CACHED_TRACK_SECOND = 20 * 60
+FILL_CONCURRENCY = 2
+STALE_PART_SECOND = 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class AudioCache:
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self.files: dict[str, int] = {}
+        self.total_bytes = 0
+        self.enforce_limit()
+
+        stale_before = time.time() - STALE_PART_SECOND
+        for path in self.directory.glob("*.part"):
+            if path.stat().st_mtime < stale_before:
+                path.unlink(missing_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+        self.fill_slots = asyncio.Semaphore(FILL_CONCURRENCY)
+        self.filling: dict[str, asyncio.Task[None]] = {}
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def path(self, video_id: str) -> Path:
+        return self.directory / f"{video_id}.ogg"
+
+    def get(self, video_id: str) -> Path | None:
+        path = self.path(video_id)
+
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            self.forget(video_id)
+            self.misses += 1
+            return None
+
+        with suppress(FileNotFoundError):
+            os.utime(path)
+        self.add_file(video_id, size)
+
+        self.hits += 1
+        self.bytes_served += size
+        return path
+
+    def schedule_fill(self, song: QueueEntry, stream: AudioStream) -> None:
+        if (
+            song.video_id in self.files
+            or song.video_id in self.filling
+            or not 0 < song.length <= MAX_CACHED_TRACK_SECOND
+        ):
+            return
+
+        self.filling[song.video_id] = asyncio.create_task(self.fill(song, stream))
+
+    async def fill(self, song: QueueEntry, stream: AudioStream) -> None:
+        path = self.path(song.video_id)
+        part_path = path.with_suffix(f".{os.getpid()}.part")
+
+        try:
+            async with self.fill_slots:
+                process = await asyncio.create_subprocess_exec(
+                    "ffmpeg",
+                    "-nostdin",
+                    "-loglevel",
+                    "error",
+                    "-reconnect",
+                    "1",
+                    "-reconnect_streamed",
+                    "1",
+                    "-i",
+                    stream.url,
+                    "-vn",
+                    "-sn",
+                    "-dn",
+                    "-c:a",
+                    stream.codec,
+                    "-f",
+                    "ogg",
+                    "-y",
+                    str(part_path),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+
+                try:
+                    return_code = await process.wait()
+                except asyncio.CancelledError:
+                    process.kill()
+                    raise
+
+            if return_code == 0:
+                part_path.replace(path)
+                self.add_file(song.video_id, path.stat().st_size)
+                self.enforce_limit()
+                logger.info(
+                    "Cached %s (%d bytes), hit ratio %.2f, %d bytes served",
+                    song.video_id,
+                    self.files.get(song.video_id, 0),
+                    self.hit_ratio,
+                    self.bytes_served,
+                )
+        finally:
+            part_path.unlink(missing_ok=True)
+            del self.filling[song.video_id]
+
+    def forget(self, video_id: str) -> None:
+        if (size := self.files.pop(video_id, None)) is not None:
+            self.total_bytes -= size
+
+    def add_file(self, video_id: str, size: int) -> None:
+        self.forget(video_id)
+        self.files[video_id] = size
+        self.total_bytes += size
+
+    def enforce_limit(self) -> None:
+        files = []
+        for path in self.directory.glob("*.ogg"):
+            with suppress(FileNotFoundError):
+                stat = path.stat()
+                files.append((stat.st_mtime, path, stat.st_size))
+
+        files.sort()
+        self.files = {path.stem: size for _, path, size in files}
+        self.total_bytes = sum(self.files.values())
+
+        for _, path, _ in files[:-1]:
+            if self.total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self.forget(path.stem)
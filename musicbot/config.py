@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from os import environ
+
+
+@dataclass(frozen=True, slots=True)
+class BotConfig:
+    prefix: str
+    metadata_path: str = "cache/metadata.sqlite3"
+    session_path: str = "cache/sessions.sqlite3"
+    command_hash_path: str = "cache/commands.sha256"
+    audio_cache_dir: str | None = None
+    audio_cache_max_bytes: int = 2 * 1024**3
+    player_idle_ttl_second: float = 30 * 60
+    metrics_address: str | None = None
+    shard_count: int | None = None
+    shard_ids: tuple[int, ...] | None = None
+    process_count: int = 1
+
+    @classmethod
+    def from_env(cls) -> BotConfig:
+        return cls(
+            prefix=environ["BOT_PREFIX"],
+            metadata_path=environ.get(
+                "METADATA_CACHE_PATH",
+                "cache/metadata.sqlite3",
+            ),
+            session_path=environ.get(
+                "SESSION_STORE_PATH",
+                "cache/sessions.sqlite3",
+            ),
+            command_hash_path=environ.get(
+                "COMMAND_HASH_PATH",
+                "cache/commands.sha256",
+            ),
+            audio_cache_dir=environ.get("AUDIO_CACHE_DIR") or None,
+            audio_cache_max_bytes=int(environ.get("AUDIO_CACHE_MAX_MB", "2048"))
+            * 1024**2,
+            player_idle_ttl_second=float(environ.get("PLAYER_IDLE_TTL_MINUTES", "30"))
+            * 60,
+            metrics_address=environ.get("METRICS_ADDRESS") or None,
+            shard_count=int(shard_count)
+            if (shard_count := environ.get("SHARD_COUNT"))
+            else None,
+            process_count=int(environ.get("PROCESS_COUNT") or "1"),
+        )
+
+    @property
+    def syncs_commands(self) -> bool:
+        return self.shard_ids is None or 0 in self.shard_ids
+
+    def owns_guild(self, guild_id: int) -> bool:
+        return (
+            self.shard_ids is None
+            or self.shard_count is None
+            or (guild_id >> 22) % self.shard_count in self.shard_ids
+        )
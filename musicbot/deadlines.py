@@ -0,0 +1,74 @@
+import asyncio
+import heapq
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+
+class DeadlineScheduler:
+    def __init__(self, on_expire: Callable[[int], Coroutine[None, None, None]]) -> None:
+        self.on_expire = on_expire
+
+        self.deadlines: dict[int, float] = {}
+        self.heap: list[tuple[float, int]] = []
+        self.expiring: set[asyncio.Task[None]] = set()
+
+        self.wakeup = asyncio.Event()
+        self.sweeper: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def schedule(self, key: int, delay_second: float) -> None:
+        deadline = time.monotonic() + delay_second
+        self.deadlines[key] = deadline
+        heapq.heappush(self.heap, (deadline, key))
+
+        if len(self.heap) > 2 * len(self.deadlines) + 64:
+            self.heap = [(deadline, key) for key, deadline in self.deadlines.items()]
+            heapq.heapify(self.heap)
+
+        if self.heap[0] == (deadline, key):
+            self.wakeup.set()
+
+    def cancel(self, key: int) -> None:
+        self.deadlines.pop(key, None)
+
+    def start(self) -> None:
+        self.sweeper = asyncio.create_task(self.sweep())
+
+    def close(self) -> None:
+        if self.sweeper:
+            self.sweeper.cancel()
+
+        for task in self.expiring:
+            task.cancel()
+
+    def pop_expired(self, now: float) -> list[int]:
+        expired = []
+
+        while self.heap and self.heap[0][0] <= now:
+            deadline, key = heapq.heappop(self.heap)
+            if self.deadlines.get(key) == deadline:
+                del self.deadlines[key]
+                expired.append(key)
+
+        return expired
+
+    async def sweep(self) -> None:
+        while True:
+            for key in self.pop_expired(time.monotonic()):
+                task = asyncio.create_task(self.on_expire(key))
+                self.expiring.add(task)
+                task.add_done_callback(self.expiring.discard)
+
+            self.wakeup.clear()
+            timeout = self.heap[0][0] - time.monotonic() if self.heap else None
+
+            try:
+                async with asyncio.timeout(timeout):
+                    await self.wakeup.wait()
+            except TimeoutError:
+                pass
@@ -0,0 +1,175 @@
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import discord
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .queue_entry import QueueEntry
+
+FRAME_SECOND = discord.opus.Encoder.FRAME_LENGTH / 1000
+PREBUFFER_FRAMES = 25
+
+
+def frames_for(second: float) -> int:
+    return round(second / FRAME_SECOND)
+
+
+def mix(outgoing: bytes, incoming: bytes, weight: float) -> bytes:
+    size = max(len(outgoing), len(incoming))
+    old = array("h", outgoing.ljust(size, b"\0"))
+    new = array("h", incoming.ljust(size, b"\0"))
+    return array(
+        "h",
+        [round(a + (b - a) * weight) for a, b in zip(old, new, strict=True)],
+    ).tobytes()
+
+
+class BufferedSource(discord.AudioSource):
+    def __init__(self, source: discord.AudioSource) -> None:
+        self.source = source
+        self.frames: deque[bytes] = deque()
+
+    def fill(self, count: int = PREBUFFER_FRAMES) -> bool:
+        while len(self.frames) < count and (frame := self.source.read()):
+            self.frames.append(frame)
+        return bool(self.frames)
+
+    def read(self) -> bytes:
+        if self.frames:
+            return self.frames.popleft()
+        return self.source.read()
+
+    def is_opus(self) -> bool:
+        return self.source.is_opus()
+
+    def cleanup(self) -> None:
+        self.frames.clear()
+        self.source.cleanup()
+
+
+@dataclass(frozen=True, slots=True)
+class Upcoming:
+    song: QueueEntry
+    source: BufferedSource
+    is_next: Callable[[], bool]
+
+
+class TrackChain(discord.AudioSource):
+    def __init__(
+        self,
+        source: discord.AudioSource,
+        song: QueueEntry,
+        offset: float,
+        on_switch: Callable[[QueueEntry, float], None],
+        *,
+        crossfade_second: float = 0.0,
+    ) -> None:
+        self.lock = threading.Lock()
+        self.on_switch = on_switch
+        self.opus = source.is_opus()
+        self.crossfade_frames = 0 if self.opus else frames_for(crossfade_second)
+
+        self.current = source
+        self.song = song
+        self.frames = frames_for(offset)
+        self.upcoming: Upcoming | None = None
+        self.incoming: BufferedSource | None = None
+        self.faded = 0
+
+    @property
+    def expected_frames(self) -> int:
+        return frames_for(self.song.length)
+
+    def is_opus(self) -> bool:
+        return self.opus
+
+    def set_upcoming(self, upcoming: Upcoming | None) -> None:
+        with self.lock:
+            previous, self.upcoming = self.upcoming, upcoming
+        if previous:
+            previous.source.cleanup()
+
+    def has_upcoming(self, song: QueueEntry) -> bool:
+        upcoming = self.upcoming
+        return upcoming is not None and upcoming.song is song and upcoming.is_next()
+
+    def pop_upcoming(self, song: QueueEntry) -> BufferedSource | None:
+        with self.lock:
+            upcoming = self.upcoming
+            if upcoming is None or upcoming.song is not song:
+                return None
+            self.upcoming = None
+        return upcoming.source
+
+    def take_upcoming(self) -> Upcoming | None:
+        upcoming, self.upcoming = self.upcoming, None
+        if upcoming and not upcoming.is_next():
+            upcoming.source.cleanup()
+            return None
+        return upcoming
+
+    def read(self) -> bytes:
+        with self.lock:
+            frame = self.current.read()
+            self.frames += 1
+
+            if self.incoming is not None:
+                return self.crossfade(frame)
+
+            if frame:
+                if (
+                    self.crossfade_frames
+                    and self.song.length
+                    and self.frames >= self.expected_frames - self.crossfade_frames
+                    and (upcoming := self.take_upcoming())
+                ):
+                    self.incoming = upcoming.source
+                    self.faded = 0
+                    self.switch_song(upcoming.song, 0.0)
+                    return self.crossfade(frame)
+                return frame
+
+            if not (upcoming := self.take_upcoming()):
+                return b""
+
+            ended_at = time.perf_counter()
+            previous, self.current = self.current, upcoming.source
+            frame = self.current.read()
+            self.switch_song(upcoming.song, time.perf_counter() - ended_at)
+            previous.cleanup()
+            return frame
+
+    def crossfade(self, frame: bytes) -> bytes:
+        incoming = self.incoming
+        if incoming is None:
+            return frame
+
+        self.faded += 1
+        mixed = mix(frame, incoming.read(), self.faded / self.crossfade_frames)
+
+        if not frame or self.faded >= self.crossfade_frames:
+            self.current.cleanup()
+            self.current, self.incoming = incoming, None
+        return mixed
+
+    def switch_song(self, song: QueueEntry, gap_second: float) -> None:
+        self.song = song
+        self.frames = 0
+        self.on_switch(song, gap_second)
+
+    def cleanup(self) -> None:
+        with self.lock:
+            upcoming, self.upcoming = self.upcoming, None
+            incoming, self.incoming = self.incoming, None
+
+        self.current.cleanup()
+        if incoming:
+            incoming.cleanup()
+        if upcoming:
+            upcoming.source.cleanup()
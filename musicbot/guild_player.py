@@ -0,0 +1,131 @@
+import sys
+import time
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from typing import TYPE_CHECKING
+
+import musicbot.song_queue as msq
+
+if TYPE_CHECKING:
+    from asyncio import Task
+
+    from .queue_entry import QueueEntry
+
+
+class PlayerState(Enum):
+    IDLE = auto()
+    LOADING = auto()
+    PLAYING = auto()
+    PAUSED = auto()
+
+
+@dataclass(slots=True)
+class GuildPlayer:
+    guild_id: int
+    queue: msq.SongQueue = field(default_factory=msq.SongQueue)
+    index: int = -1
+    current: QueueEntry | None = None
+    loop_queue: bool = False
+    crossfade_second: float = 0.0
+
+    state: PlayerState = PlayerState.IDLE
+    generation: int = 0
+    cursor_version: int = 0
+
+    progress_time: float = 0.0
+    pause_time: float = 0.0
+    resume_offset: float = 0.0
+    seek_offset: float | None = None
+    stop_requested: bool = False
+    recoveries: int = 0
+    idle_since: float = field(default_factory=time.monotonic)
+
+    loaders: set[Task[None]] = field(default_factory=set)
+
+    @property
+    def progress(self) -> float:
+        now = time.monotonic()
+        paused_for = now - self.pause_time if self.pause_time else 0.0
+        return now - self.progress_time - paused_for
+
+    def memory_usage(self) -> int:
+        queue = self.queue
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(queue)
+            + sys.getsizeof(queue.entries)
+            + sys.getsizeof(queue.body_lengths)
+            + sys.getsizeof(queue.page_starts)
+            + queue.entry_bytes
+        )
+
+    def advance(self) -> QueueEntry | None:
+        if self.seek_offset is not None and self.current:
+            self.resume_offset, self.seek_offset = self.seek_offset, None
+            return self.current
+
+        if self.index + 1 >= len(self.queue):
+            if not self.loop_queue or not self.queue:
+                self.current = None
+                return None
+
+            self.index = -1
+
+        self.index += 1
+        self.recoveries = 0
+        self.current = self.queue[self.index]
+        self.progress_time = time.monotonic()
+        self.pause_time = 0.0
+        return self.current
+
+    def peek_next(self) -> QueueEntry | None:
+        if self.seek_offset is not None:
+            return None
+        if self.index + 1 < len(self.queue):
+            return self.queue[self.index + 1]
+        if self.loop_queue and self.queue:
+            return self.queue[0]
+        return None
+
+    def jump(self, index: int) -> QueueEntry:
+        song = self.queue[index]
+        self.index = index % len(self.queue) - 1
+        self.resume_offset = 0.0
+        self.seek_offset = None
+        self.cursor_version += 1
+        return song
+
+    def clear(self) -> None:
+        self.queue.clear()
+        self.index = -1
+        self.resume_offset = 0.0
+        self.seek_offset = None
+        self.cursor_version += 1
+
+    def seek(self, offset: float) -> None:
+        self.seek_offset = offset
+        self.cursor_version += 1
+
+    def mark_started(self, offset: float) -> None:
+        self.state = PlayerState.PLAYING
+        self.stop_requested = False
+        self.progress_time = time.monotonic() - offset
+        self.pause_time = 0.0
+
+    def ended_early(self, tolerance_second: float) -> bool:
+        return (
+            self.current is not None
+            and not self.stop_requested
+            and self.progress < self.current.length - tolerance_second
+        )
+
+    def pause(self) -> None:
+        if self.state is PlayerState.PLAYING:
+            self.state = PlayerState.PAUSED
+            self.pause_time = time.monotonic()
+
+    def resume(self) -> None:
+        if self.state is PlayerState.PAUSED:
+            self.state = PlayerState.PLAYING
+            self.progress_time += time.monotonic() - self.pause_time
+            self.pause_time = 0.0
@@ -0,0 +1,113 @@
+import string
+from dataclasses import dataclass
+from enum import Enum, auto
+from urllib.parse import parse_qs, urlsplit
+
+YOUTUBE_HOSTS = frozenset({
+    "youtube.com",
+    "www.youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+})
+SHORT_YOUTUBE_HOSTS = frozenset({"youtu.be", "www.youtu.be"})
+YOUTUBE_VIDEO_PATHS = frozenset({"embed", "e", "v", "shorts", "live"})
+EMBEDDED_PLAYLIST_PATH = "videoseries"
+
+SPOTIFY_HOST = "open.spotify.com"
+SPOTIFY_TYPES = frozenset({"track", "album", "playlist"})
+
+URL_SCHEMES = frozenset({"http", "https"})
+ID_CHARACTERS = frozenset(string.ascii_letters + string.digits + "_-")
+SPOTIFY_ID_CHARACTERS = frozenset(string.ascii_letters + string.digits)
+
+VIDEO_ID_LENGTH = 11
+MIN_PLAYLIST_ID_LENGTH = 34
+SPOTIFY_ID_LENGTH = 22
+
+
+class LinkKind(Enum):
+    YOUTUBE_VIDEO = auto()
+    YOUTUBE_PLAYLIST = auto()
+    SPOTIFY = auto()
+
+
+@dataclass(frozen=True, slots=True)
+class Link:
+    kind: LinkKind
+    link_id: str
+    spotify_type: str = ""
+
+
+def is_video_id(text: str) -> bool:
+    return len(text) == VIDEO_ID_LENGTH and ID_CHARACTERS.issuperset(text)
+
+
+def is_playlist_id(text: str) -> bool:
+    return len(text) >= MIN_PLAYLIST_ID_LENGTH and ID_CHARACTERS.issuperset(text)
+
+
+def is_spotify_id(text: str) -> bool:
+    return len(text) == SPOTIFY_ID_LENGTH and SPOTIFY_ID_CHARACTERS.issuperset(text)
+
+
+def classify_link(text: str) -> Link | None:
+    text = text.strip()
+    if not text or any(character.isspace() for character in text):
+        return None
+
+    has_scheme = "://" in text
+    try:
+        parts = urlsplit(text if has_scheme else f"https://{text}")
+        host = parts.hostname
+    except ValueError:
+        return None
+
+    if parts.scheme not in URL_SCHEMES or host is None:
+        return None
+
+    segments = [segment for segment in parts.path.split("/") if segment]
+
+    if host in YOUTUBE_HOSTS or host in SHORT_YOUTUBE_HOSTS:
+        return youtube_link(host, segments, parse_qs(parts.query))
+    if host == SPOTIFY_HOST and has_scheme:
+        return spotify_link(segments)
+    return None
+
+
+def youtube_link(
+    host: str,
+    segments: list[str],
+    query: dict[str, list[str]],
+) -> Link | None:
+    match segments:
+        case [video_id] if host in SHORT_YOUTUBE_HOSTS:
+            pass
+        case ["watch"] if host in YOUTUBE_HOSTS:
+            video_id = query.get("v", [""])[0]
+        case [path, video_id] if (
+            path in YOUTUBE_VIDEO_PATHS and video_id != EMBEDDED_PLAYLIST_PATH
+        ):
+            pass
+        case _:
+            video_id = ""
+
+    if is_video_id(video_id):
+        return Link(LinkKind.YOUTUBE_VIDEO, video_id)
+
+    playlist_id = query.get("list", [""])[0]
+    if is_playlist_id(playlist_id):
+        return Link(LinkKind.YOUTUBE_PLAYLIST, playlist_id)
+    return None
+
+
+def spotify_link(segments: list[str]) -> Link | None:
+    if segments and segments[0].startswith("intl-"):
+        segments = segments[1:]
+
+    match segments:
+        case [spotify_type, spotify_id] if (
+            spotify_type in SPOTIFY_TYPES and is_spotify_id(spotify_id)
+        ):
+            return Link(LinkKind.SPOTIFY, spotify_id, spotify_type)
+        case _:
+            return None
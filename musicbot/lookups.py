@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from urllib.error import HTTPError
+
+from aiohttp import ClientResponseError
+from pytubefix.exceptions import BotDetection, LoginRequired, PoTokenRequired
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Generator
+
+TOO_MANY_REQUESTS = 429
+MIN_BACKOFF_SECOND = 2.0
+MAX_BACKOFF_SECOND = 5 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottledError(TimeoutError):
+    pass
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    if isinstance(error, HTTPError):
+        return error.code == TOO_MANY_REQUESTS
+    if isinstance(error, ClientResponseError):
+        return error.status == TOO_MANY_REQUESTS
+    return isinstance(error, BotDetection | LoginRequired | PoTokenRequired)
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self.calls: dict[str, asyncio.Future] = {}
+        self.stats = Counter[str]()
+
+    async def run[T](self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        if (call := self.calls.get(key)) is None:
+            call = self.calls[key] = asyncio.ensure_future(func())
+            call.add_done_callback(functools.partial(self.finish, key))
+            self.stats["started"] += 1
+        else:
+            self.stats["coalesced"] += 1
+
+        return await asyncio.shield(call)
+
+    def finish(self, key: str, call: asyncio.Future) -> None:
+        if self.calls.get(key) is call:
+            del self.calls[key]
+
+        if not call.cancelled():
+            call.exception()
+
+
+class Throttle:
+    def __init__(self, rate_per_second: float = 5.0, burst: int = 10) -> None:
+        self.max_rate = rate_per_second
+        self.min_rate = rate_per_second / 16
+        self.rate = rate_per_second
+        self.burst = burst
+
+        self.lock = threading.Lock()
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.backoff_second = 0.0
+        self.blocked_until = 0.0
+        self.stats = Counter[str]()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                self.stats["rejected"] += 1
+                raise ThrottledError
+
+            self.tokens = self.available(now) - 1
+            self.updated = now
+            self.stats["acquired"] += 1
+
+    def available(self, now: float) -> float:
+        return min(self.burst, self.tokens + (now - self.updated) * self.rate)
+
+    async def wait(self) -> None:
+        with self.lock:
+            delay = -self.available(time.monotonic()) / self.rate
+
+        if delay > 0:
+            self.stats["delayed"] += 1
+            await asyncio.sleep(delay)
+
+    def throttled(self) -> None:
+        with self.lock:
+            self.backoff_second = min(
+                max(self.backoff_second * 2, MIN_BACKOFF_SECOND),
+                MAX_BACKOFF_SECOND,
+            )
+            self.blocked_until = time.monotonic() + self.backoff_second
+            self.rate = max(self.rate / 2, self.min_rate)
+            self.stats["backoffs"] += 1
+
+        logger.warning(
+            "Upstream throttled us, pausing lookups for %.0fs at %.2f/s",
+            self.backoff_second,
+            self.rate,
+        )
+
+    def succeeded(self) -> None:
+        with self.lock:
+            self.backoff_second /= 2
+            self.rate = min(self.rate + self.max_rate / 16, self.max_rate)
+
+    @contextmanager
+    def guard(self) -> Generator[None]:
+        self.acquire()
+        try:
+            yield
+        except Exception as error:
+            if not is_throttle_error(error):
+                raise
+            self.throttled()
+            raise ThrottledError from error
+        self.succeeded()
@@ -0,0 +1,400 @@
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytubefix import Playlist, Search, YouTube
+from pytubefix.exceptions import PytubeFixError
+
+import musicbot.lookups as mlk
+import musicbot.utils as mu
+
+from .queue_entry import QueueEntry
+from .search_index import SearchIndex, normalize_query
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+PLAYLIST_PAGE_SIZE = 100
+
+MATCH_CANDIDATES = 5
+SUGGESTION_CANDIDATES = 10
+MATCH_DURATION_TOLERANCE_SECOND = 5
+
+
+@dataclass(frozen=True)
+class PlaylistInfo:
+    playlist_id: str
+    title: str
+    length: int
+    thumbnail_url: str
+
+    @property
+    def kind(self) -> str:
+        return "playlist"
+
+    @property
+    def playlist_url(self) -> str:
+        return f"https://www.youtube.com/playlist?list={self.playlist_id}"
+
+
+class MetadataPlaylist(Playlist):
+    def __init__(self, playlist_id: str) -> None:
+        super().__init__(f"https://www.youtube.com/playlist?list={playlist_id}")
+        self.entries: dict[str, QueueEntry] = {}
+
+    def _extract_video_id(self, x: dict) -> str | list:
+        with suppress(KeyError, IndexError, TypeError, ValueError):
+            renderer = x["playlistVideoRenderer"]
+            byline = renderer["shortBylineText"]["runs"][0]
+            channel_id = byline["navigationEndpoint"]["browseEndpoint"]["browseId"]
+
+            self.entries[renderer["videoId"]] = QueueEntry(
+                video_id=renderer["videoId"],
+                title=renderer["title"]["runs"][0]["text"],
+                author=byline["text"],
+                length=int(renderer["lengthSeconds"]),
+                thumbnail_url=renderer["thumbnail"]["thumbnails"][-1]["url"],
+                channel_url=f"https://www.youtube.com/channel/{channel_id}",
+            )
+
+        return super()._extract_video_id(x)
+
+
+class PlaylistPages:
+    def __init__(self, pages: Iterator[list[QueueEntry]], skipped: list[str]) -> None:
+        self.pages = pages
+        self.skipped = skipped
+        self.loaded: list[list[QueueEntry]] = []
+        self.lock = threading.Lock()
+
+    def page(self, index: int) -> list[QueueEntry] | None:
+        with self.lock:
+            while len(self.loaded) <= index:
+                if (page := next(self.pages, None)) is None:
+                    return None
+                self.loaded.append(page)
+            return self.loaded[index]
+
+
+class MetadataSearch(Search):
+    def __init__(self, query: str) -> None:
+        super().__init__(query)
+        self.entries: dict[str, QueueEntry] = {}
+
+    def fetch_query(
+        self,
+        continuation: str | None = None,
+        filters: dict | None = None,
+    ) -> dict:
+        results = super().fetch_query(continuation, filters)
+
+        for renderer in find_renderers(results, "videoRenderer"):
+            with suppress(KeyError, IndexError, TypeError, ValueError):
+                owner = renderer["ownerText"]["runs"][0]
+                channel_id = owner["navigationEndpoint"]["browseEndpoint"]["browseId"]
+
+                self.entries[renderer["videoId"]] = QueueEntry(
+                    video_id=renderer["videoId"],
+                    title=renderer["title"]["runs"][0]["text"],
+                    author=owner["text"],
+                    length=mu.parse_time(renderer["lengthText"]["simpleText"]),
+                    thumbnail_url=renderer["thumbnail"]["thumbnails"][-1]["url"],
+                    channel_url=f"https://www.youtube.com/channel/{channel_id}",
+                )
+
+        return results
+
+
+class MetadataCache:
+    def __init__(
+        self,
+        path: str,
+        ttl_second: float = 7 * 24 * 60 * 60,
+        max_entries: int = 50_000,
+        throttle: mlk.Throttle | None = None,
+    ) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self.lock = threading.Lock()
+        self.ttl_second = ttl_second
+        self.max_entries = max_entries
+        self.throttle = throttle or mlk.Throttle()
+
+        self.hits = Counter[str]()
+        self.misses = Counter[str]()
+        self.writes = Counter[str]()
+        self.index = SearchIndex()
+
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (kind, key))",
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed_at "
+                "ON entries (kind, accessed_at)",
+            )
+
+    def get(self, kind: str, key: str) -> str | None:
+        now = time.time()
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM entries "
+                "WHERE kind = ? AND key = ? AND expires_at > ?",
+                (kind, key, now),
+            ).fetchone()
+
+            if row is None:
+                self.misses[kind] += 1
+                return None
+
+            self.connection.execute(
+                "UPDATE entries SET accessed_at = ? WHERE kind = ? AND key = ?",
+                (now, kind, key),
+            )
+
+        self.hits[kind] += 1
+        return row[0]
+
+    def put(self, kind: str, key: str, value: object) -> None:
+        now = time.time()
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(value), now + self.ttl_second, now),
+            )
+            self.writes[kind] += 1
+
+            if self.writes[kind] % 256 == 0:
+                self.evict(kind, now)
+
+    def evict(self, kind: str, now: float) -> None:
+        self.connection.execute(
+            "DELETE FROM entries WHERE kind = ? AND expires_at <= ?",
+            (kind, now),
+        )
+        self.connection.execute(
+            "DELETE FROM entries WHERE kind = ? AND key IN ("
+            "SELECT key FROM entries WHERE kind = ? "
+            "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (kind, kind, self.max_entries),
+        )
+
+    def video(self, video_id: str) -> QueueEntry:
+        if cached := self.get("videos", video_id):
+            return QueueEntry(**json.loads(cached))
+
+        with self.throttle.guard():
+            info = QueueEntry.from_youtube(
+                YouTube(f"https://www.youtube.com/watch?v={video_id}", "WEB_MUSIC"),
+            )
+        self.put("videos", video_id, asdict(info))
+        self.index.add(info.title, info)
+        return info
+
+    def search(self, query: str) -> QueueEntry:
+        normalized_query = normalize_query(query)
+
+        if cached := self.get("searches", normalized_query):
+            return self.video(json.loads(cached))
+
+        with self.throttle.guard():
+            info = QueueEntry.from_youtube(Search(query).videos[0])
+        self.put("searches", normalized_query, info.video_id)
+        self.put("videos", info.video_id, asdict(info))
+        self.index.add(normalized_query, info)
+        self.index.add(info.title, info)
+        return info
+
+    def search_results(self, query: str, count: int) -> list[QueueEntry]:
+        search = MetadataSearch(query)
+        with self.throttle.guard():
+            search.fetch_and_parse()
+
+        results = list(search.entries.values())[:count]
+        for info in results:
+            self.put("videos", info.video_id, asdict(info))
+            self.index.add(info.title, info)
+        return results
+
+    def suggest(self, query: str) -> list[QueueEntry]:
+        suggestions = self.search_results(query, SUGGESTION_CANDIDATES)
+
+        if suggestions:
+            self.put("searches", normalize_query(query), suggestions[0].video_id)
+            self.index.add(query, suggestions[0])
+
+        return suggestions
+
+    def load_index(self) -> None:
+        now = time.time()
+
+        with self.lock:
+            videos = {
+                video_id: QueueEntry(**json.loads(value))
+                for video_id, value in self.connection.execute(
+                    "SELECT key, value FROM entries "
+                    "WHERE kind = 'videos' AND expires_at > ?",
+                    (now,),
+                )
+            }
+            searches = self.connection.execute(
+                "SELECT key, value FROM entries "
+                "WHERE kind = 'searches' AND expires_at > ?",
+                (now,),
+            ).fetchall()
+
+        for info in videos.values():
+            self.index.add(info.title, info)
+
+        for query, video_id in searches:
+            if info := videos.get(json.loads(video_id)):
+                self.index.add(query, info)
+
+    def match(self, query: str, duration: int | None) -> QueueEntry:
+        if duration is None:
+            return self.search(query)
+
+        if cached := self.get("matches", match_key(query, duration)):
+            return self.video(json.loads(cached))
+
+        candidates = self.search_results(query, MATCH_CANDIDATES)
+
+        def distance(info: QueueEntry) -> int:
+            return abs(info.length - duration)
+
+        best_match = next(
+            (
+                info
+                for info in candidates
+                if distance(info) <= MATCH_DURATION_TOLERANCE_SECOND
+            ),
+            None,
+        ) or min(candidates, key=distance, default=None)
+
+        if best_match is None:
+            error_msg = f"No search results for {query!r}"
+            raise IndexError(error_msg)
+
+        self.put("matches", match_key(query, duration), best_match.video_id)
+        return best_match
+
+    def playlist(
+        self,
+        playlist_id: str,
+    ) -> tuple[PlaylistInfo, PlaylistPages]:
+        skipped: list[str] = []
+
+        if cached := self.get("playlists", playlist_id):
+            fields = json.loads(cached)
+            video_ids = fields.pop("video_ids")
+            return PlaylistInfo(**fields), PlaylistPages(
+                self.cached_playlist_pages(video_ids, skipped),
+                skipped,
+            )
+
+        playlist = MetadataPlaylist(playlist_id)
+        with self.throttle.guard():
+            playlist_info = PlaylistInfo(
+                playlist_id=playlist_id,
+                title=playlist.title,
+                length=playlist.length,
+                thumbnail_url=playlist.thumbnail_url,
+            )
+        return playlist_info, PlaylistPages(
+            self.playlist_pages(playlist_info, playlist, skipped),
+            skipped,
+        )
+
+    def playlist_video(self, video_id: str, skipped: list[str]) -> QueueEntry | None:
+        try:
+            return self.video(video_id)
+        except PytubeFixError:
+            skipped.append(video_id)
+            return None
+
+    def cached_playlist_pages(
+        self,
+        video_ids: list[str],
+        skipped: list[str],
+    ) -> Iterator[list[QueueEntry]]:
+        for page in itertools.batched(video_ids, PLAYLIST_PAGE_SIZE, strict=False):
+            if videos := [
+                info
+                for video_id in page
+                if (info := self.playlist_video(video_id, skipped))
+            ]:
+                yield videos
+
+    def playlist_pages(
+        self,
+        playlist_info: PlaylistInfo,
+        playlist: MetadataPlaylist,
+        skipped: list[str],
+    ) -> Iterator[list[QueueEntry]]:
+        video_ids = []
+        pages = itertools.batched(
+            playlist.url_generator(),
+            PLAYLIST_PAGE_SIZE,
+            strict=False,
+        )
+
+        while True:
+            with self.throttle.guard():
+                page = next(pages, None)
+            if page is None:
+                break
+
+            videos = []
+            for url in page:
+                video_id = url.rsplit("=", 1)[-1]
+                if info := playlist.entries.pop(video_id, None):
+                    self.put("videos", video_id, asdict(info))
+                    self.index.add(info.title, info)
+                elif not (info := self.playlist_video(video_id, skipped)):
+                    continue
+                videos.append(info)
+
+            video_ids.extend(info.video_id for info in videos)
+            if videos:
+                yield videos
+
+        self.put(
+            "playlists",
+            playlist_info.playlist_id,
+            asdict(playlist_info) | {"video_ids": video_ids},
+        )
+
+
+def match_key(query: str, duration: int) -> str:
+    return f"{duration}:{normalize_query(query)}"
+
+
+def find_renderers(data: object, name: str) -> Iterator[dict]:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == name:
+                yield value
+            else:
+                yield from find_renderers(value, name)
+    elif isinstance(data, list):
+        for item in data:
+            yield from find_renderers(item, name)
@@ -0,0 +1,306 @@
+import asyncio
+import bisect
+import logging
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import musicbot.guild_player as mgp
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator
+    from types import ModuleType
+
+    from aiohttp import web
+
+    from .music_bot import MusicBot
+
+LATENCY_BUCKETS_SECOND = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+LOOP_LAG_INTERVAL_SECOND = 0.5
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRIC_HELP = {
+    "musicbot_command_seconds": "Time spent running a command",
+    "musicbot_resolve_seconds": "Time spent resolving a song or playlist",
+    "musicbot_autocomplete_seconds": "Time spent answering song autocomplete",
+    "musicbot_stream_resolve_seconds": "Time spent getting a playable stream",
+    "musicbot_transition_gap_seconds": "Silence between one song and the next",
+    "musicbot_loop_lag_seconds": "Event loop scheduling delay",
+}
+
+type Labels = tuple[tuple[str, str], ...]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Histogram:
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_SECOND) + 1),
+    )
+    total: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_SECOND, value)] += 1
+        self.total += value
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+def format_metric(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: Iterable[tuple[Labels, float]],
+) -> Iterator[str]:
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        yield f"{name}{format_labels(labels)} {value}"
+
+
+def format_histogram(name: str, series: dict[Labels, Histogram]) -> Iterator[str]:
+    yield f"# HELP {name} {METRIC_HELP[name]}"
+    yield f"# TYPE {name} histogram"
+
+    for labels, histogram in series.items():
+        count = 0
+        for bound, bucket in zip(
+            (*LATENCY_BUCKETS_SECOND, "+Inf"),
+            histogram.buckets,
+            strict=True,
+        ):
+            count += bucket
+            bucket_labels = format_labels((*labels, ("le", str(bound))))
+            yield f"{name}_bucket{bucket_labels} {count}"
+
+        yield f"{name}_sum{format_labels(labels)} {histogram.total:g}"
+        yield f"{name}_count{format_labels(labels)} {count}"
+
+
+class Metrics:
+    def __init__(self, bot: MusicBot, address: str | None = None) -> None:
+        self.bot = bot
+        self.address = address
+
+        self.histograms = defaultdict[str, dict[Labels, Histogram]](dict)
+        self.web: ModuleType | None = None
+        self.runner: web.AppRunner | None = None
+        self.lag_probe: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if not self.address:
+            return
+
+        host, _, port = self.address.rpartition(":")
+        from aiohttp import web  # ruff: ignore[import-outside-top-level]
+
+        self.web = web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host or "127.0.0.1", int(port)).start()
+
+        self.lag_probe = asyncio.create_task(self.probe_loop_lag())
+        logger.info("Serving metrics on http://%s/metrics", self.address)
+
+    async def close(self) -> None:
+        if self.lag_probe:
+            self.lag_probe.cancel()
+
+        if self.runner:
+            await self.runner.cleanup()
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        series = self.histograms[name]
+        key = tuple(labels.items())
+
+        if not (histogram := series.get(key)):
+            histogram = series[key] = Histogram()
+
+        histogram.observe(value)
+
+    @contextmanager
+    def timed(self, name: str, **labels: str) -> Generator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    async def probe_loop_lag(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LOOP_LAG_INTERVAL_SECOND)
+            self.observe(
+                "musicbot_loop_lag_seconds",
+                time.perf_counter() - started - LOOP_LAG_INTERVAL_SECOND,
+            )
+
+    async def handle(self, _: web.Request) -> web.Response:
+        return self.web.Response(
+            body=self.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        for name, series in self.histograms.items():
+            lines.extend(format_histogram(name, series))
+
+        for name, kind, help_text, samples in self.collect():
+            lines.extend(format_metric(name, kind, help_text, samples))
+
+        return "\n".join(lines) + "\n"
+
+    def collect(
+        self,
+    ) -> Iterator[tuple[str, str, str, Iterable[tuple[Labels, float]]]]:
+        bot = self.bot
+        states = Counter(player.state for player in bot.players)
+
+        yield (
+            "musicbot_voice_clients",
+            "gauge",
+            "Connected voice clients",
+            [((), len(bot.voice_clients))],
+        )
+        yield (
+            "musicbot_players",
+            "gauge",
+            "Guild players in memory by state",
+            [
+                ((("state", state.name.lower()),), states[state])
+                for state in mgp.PlayerState
+            ],
+        )
+        yield (
+            "musicbot_queued_songs",
+            "gauge",
+            "Songs queued across all guilds",
+            [((), sum(len(player.queue) for player in bot.players))],
+        )
+        yield (
+            "musicbot_player_evictions_total",
+            "counter",
+            "Idle guild players evicted from memory",
+            [((), bot.players.evicted)],
+        )
+        yield (
+            "musicbot_metadata_cache_requests_total",
+            "counter",
+            "Metadata cache lookups by kind and result",
+            [
+                ((("kind", kind), ("result", result)), count)
+                for result, counter in (
+                    ("hit", bot.metadata.hits),
+                    ("miss", bot.metadata.misses),
+                )
+                for kind, count in counter.items()
+            ],
+        )
+        yield (
+            "musicbot_autocomplete_total",
+            "counter",
+            "Song autocomplete answers by source",
+            [
+                ((("source", source),), count)
+                for source, count in bot.suggestions.stats.items()
+            ],
+        )
+        yield (
+            "musicbot_search_index_keys",
+            "gauge",
+            "Titles and queries in the local search index",
+            [((), len(bot.metadata.index))],
+        )
+        yield (
+            "musicbot_lookups_total",
+            "counter",
+            "Upstream lookups started or merged into one already running",
+            [
+                ((("upstream", upstream), ("result", result)), count)
+                for upstream, lookups in (
+                    ("youtube", bot.resolver.lookups),
+                    ("spotify", bot.spotify.lookups),
+                )
+                for result, count in lookups.stats.items()
+            ],
+        )
+        yield (
+            "musicbot_throttle_total",
+            "counter",
+            "YouTube rate limiter acquisitions, delays and backoffs",
+            [
+                ((("event", event),), count)
+                for event, count in bot.throttle.stats.items()
+            ],
+        )
+        yield (
+            "musicbot_throttle_rate",
+            "gauge",
+            "Current YouTube request rate limit per second",
+            [((), bot.throttle.rate)],
+        )
+        yield (
+            "musicbot_outbox_queued",
+            "gauge",
+            "Messages and edits waiting to be sent to Discord",
+            [((), bot.outbox.queued)],
+        )
+        yield (
+            "musicbot_outbox_total",
+            "counter",
+            "Discord messages sent, edited or merged, and 429 responses",
+            [((("event", event),), count) for event, count in bot.outbox.stats.items()],
+        )
+        yield (
+            "musicbot_playback_events_total",
+            "counter",
+            "Playback events such as stream recoveries",
+            [
+                ((("event", event),), count)
+                for event, count in bot.playback.stats.items()
+            ],
+        )
+
+        if audio_cache := bot.audio_cache:
+            yield (
+                "musicbot_audio_cache_requests_total",
+                "counter",
+                "Audio cache lookups by result",
+                [
+                    ((("result", "hit"),), audio_cache.hits),
+                    ((("result", "miss"),), audio_cache.misses),
+                ],
+            )
+            yield (
+                "musicbot_audio_cache_served_bytes_total",
+                "counter",
+                "Bytes of audio played from the local cache",
+                [((), audio_cache.bytes_served)],
+            )
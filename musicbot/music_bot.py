@@ -1,121 +1,451 @@
 import asyncio
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import textwrap
 import time
-from asyncio import Task
-from collections import defaultdict
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import discord
-from discord import VoiceClient
-from discord.ext.commands import Bot, Context
-from pytubefix import Playlist, YouTube
+from discord.ext.commands import AutoShardedBot, Context
+from pytubefix.exceptions import PytubeFixError
 
+import musicbot.audio_cache as mac
+import musicbot.config as mcf
+import musicbot.guild_player as mgp
+import musicbot.links as ml
+import musicbot.lookups as mlk
+import musicbot.metadata as mm
+import musicbot.metrics as mmt
 import musicbot.music_commands as mc
+import musicbot.outbox as mo
+import musicbot.playback as mpb
+import musicbot.player_registry as mpr
+import musicbot.queue_entry as mq
+import musicbot.resolver as mr
+import musicbot.sessions as msn
+import musicbot.spotify as msp
+import musicbot.streams as ms
+import musicbot.suggestions as msu
 import musicbot.utils as mu
 
+if TYPE_CHECKING:
+    from asyncio import Task
+    from collections.abc import Coroutine, Sequence
 
-class MusicBot(Bot):
-    def __init__(self, prefix: str) -> None:
+logger = logging.getLogger(__name__)
+
+EMBED_FIELD_VALUE_LIMIT = 1024
+
+
+def read_command_hash(path: Path) -> str | None:
+    with suppress(FileNotFoundError):
+        return path.read_text(encoding="utf-8").strip()
+    return None
+
+
+def write_command_hash(path: Path, command_hash: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(command_hash, encoding="utf-8")
+
+
+class MusicBot(AutoShardedBot):
+    def __init__(self, config: mcf.BotConfig) -> None:
         intents = discord.Intents(
             guilds=True,
             guild_messages=True,
             message_content=True,
             voice_states=True,
         )
-        super().__init__(command_prefix=prefix, intents=intents)
-
-        self.song_queues = defaultdict[int, list[YouTube]](list)
-        self.song_indexes = defaultdict[int, int](lambda: -1)
-        self.cur_songs = defaultdict[int, YouTube | None](lambda: None)
+        super().__init__(
+            command_prefix=config.prefix,
+            intents=intents,
+            shard_count=config.shard_count,
+            shard_ids=list(config.shard_ids) if config.shard_ids else None,
+        )
+        self.config = config
 
-        self.progress_time = defaultdict[int, float](float)
-        self.pause_time = defaultdict[int, float](float)
+        self.players = mpr.PlayerRegistry(
+            self.is_voice_connected,
+            config.player_idle_ttl_second,
+        )
 
-        self.loop_queue = defaultdict[int, bool](bool)
-        self.idle_checkers = defaultdict[int, Task[None] | None](lambda: None)
+        self.playlist_page_timeout_second = 2 * 60
+        self.progress_edit_interval_second = 2.0
 
-        self.timeout_second = 5 * 60
+        self.throttle = mlk.Throttle()
+        self.resolver = mr.Resolver(self.throttle)
+        self.metadata = mm.MetadataCache(config.metadata_path, throttle=self.throttle)
+        self.streams = ms.StreamCache(self.resolver, self.throttle)
+        self.suggestions = msu.Suggestions(self.metadata, self.resolver)
+        self.spotify = msp.SpotifyClient()
+        self.sessions = msn.SessionStore(config.session_path, config.owns_guild)
+        self.audio_cache = (
+            mac.AudioCache(config.audio_cache_dir, config.audio_cache_max_bytes)
+            if config.audio_cache_dir
+            else None
+        )
+        self.playback = mpb.Playback(self)
+        self.outbox = mo.Outbox()
+        self.metrics = mmt.Metrics(self, config.metrics_address)
 
     async def setup_hook(self) -> None:
+        await self.spotify.start()
+        await asyncio.to_thread(self.metadata.load_index)
         await self.add_cog(mc.MusicCommands(self))
+        if self.config.syncs_commands:
+            await self.sync_commands()
+        self.players.start()
+        self.playback.start()
+        self.outbox.start()
+        await self.sessions.start(self.players)
+        await self.metrics.start()
+
+    async def close(self) -> None:
+        await self.metrics.close()
+        await self.sessions.close(self.players)
+        self.players.close()
+        self.playback.close()
+        self.outbox.close()
+        await super().close()
+        await self.spotify.close()
+        self.resolver.shutdown()
+
+    def command_hash(self) -> str:
+        commands = json.dumps(
+            [command.to_dict(self.tree) for command in self.tree.get_commands()],
+            sort_keys=True,
+        )
+        return hashlib.sha256(f"{self.application_id}:{commands}".encode()).hexdigest()
+
+    async def sync_commands(self) -> None:
+        path = Path(self.config.command_hash_path)
+        command_hash = self.command_hash()
+
+        if await asyncio.to_thread(read_command_hash, path) == command_hash:
+            logger.info("Application commands unchanged, skipping sync")
+            return
+
         await self.tree.sync()
+        await asyncio.to_thread(write_command_hash, path, command_hash)
+        logger.info("Synced application commands")
 
-    async def add_playlist(self, ctx: Context, playlist: Playlist) -> None:
-        self.song_queues[mu.get_guild_id(ctx)].extend(playlist.videos)
+    async def resolve_and_add(self, ctx: Context, song: str) -> None:
+        resolver = self.resolver
+        metadata = self.metadata
+        timed = functools.partial(self.metrics.timed, "musicbot_resolve_seconds")
 
-        await ctx.send(
-            embed=mu.make_embed(
-                ctx=ctx,
-                title=f"🎶 Playlist Queued: {playlist.title}",
-                description=f"**{playlist.length} songs added**",
-                embed_url=playlist.playlist_url,
-                thumbnail_url=playlist.thumbnail_url,
+        link = ml.classify_link(song)
+
+        if link is None:
+            with timed(kind="search"):
+                youtube_song = await resolver.resolve(
+                    ctx,
+                    metadata.search,
+                    song,
+                    key=f"search:{mm.normalize_query(song)}",
+                )
+            await self.add_song(ctx, youtube_song)
+
+        elif link.kind is ml.LinkKind.YOUTUBE_PLAYLIST:
+            playlist_id = link.link_id
+            with timed(kind="playlist"):
+                playlist, pages = await resolver.resolve(
+                    ctx,
+                    metadata.playlist,
+                    playlist_id,
+                    key=f"playlist:{playlist_id}",
+                )
+            await self.add_playlist(ctx, playlist, pages)
+
+        elif link.kind is ml.LinkKind.YOUTUBE_VIDEO:
+            youtube_id = link.link_id
+            with timed(kind="youtube"):
+                youtube_song = await resolver.resolve(
+                    ctx,
+                    metadata.video,
+                    youtube_id,
+                    key=f"video:{youtube_id}",
+                )
+            await self.add_song(ctx, youtube_song)
+
+        else:
+            spotify_type = link.spotify_type
+            spotify_id = link.link_id
+
+            if spotify_type == "track":
+                track = await self.spotify.track(spotify_id)
+                with timed(kind="spotify"):
+                    youtube_song = await resolver.resolve(
+                        ctx,
+                        metadata.match,
+                        track.title,
+                        track.duration,
+                        key=f"match:{mm.match_key(track.title, track.duration)}",
+                    )
+                await self.add_song(ctx, youtube_song)
+            else:
+                collection = await self.spotify.collection(
+                    spotify_type,
+                    spotify_id,
+                )
+                await self.add_collection(ctx, collection)
+
+    async def add_playlist(
+        self,
+        ctx: Context,
+        playlist: mm.PlaylistInfo,
+        pages: mm.PlaylistPages,
+    ) -> None:
+        player = self.players.get(mu.get_guild_id(ctx))
+
+        videos = await self.resolver.resolve(ctx, pages.page, 0) or []
+        player.queue.extend(videos)
+        self.playback.prefetch(player)
+
+        message = await self.outbox.respond(
+            ctx,
+            self.make_playlist_embed(
+                ctx,
+                playlist,
+                len(videos),
+                done=False,
+                skipped=pages.skipped,
             ),
         )
 
-    async def add_song(self, ctx: Context, song: YouTube) -> None:
-        guild_id = mu.get_guild_id(ctx)
-        self.song_queues[guild_id].append(song)
+        self.start_loader(
+            player,
+            self.load_playlist(ctx, message, playlist, pages, len(videos)),
+        )
 
-        await ctx.send(
-            embed=mu.make_embed(
-                ctx=ctx,
-                title=f"🎵 Queued - at position #{len(self.song_queues[guild_id])}",
-                description=f"[{song.title}]({song.watch_url}) by "
-                f"[{song.author}]({song.channel_url}) "
-                f"`{mu.time_format(song.length)}`",
-                thumbnail_url=song.thumbnail_url,
+    async def load_playlist(
+        self,
+        ctx: Context,
+        message: discord.Message,
+        playlist: mm.PlaylistInfo,
+        pages: mm.PlaylistPages,
+        loaded: int,
+    ) -> None:
+        player = self.players.get(mu.get_guild_id(ctx))
+        page_indexes = itertools.count(1)
+
+        try:
+            while videos := await self.resolver.run(
+                player.guild_id,
+                pages.page,
+                next(page_indexes),
+                timeout_second=self.playlist_page_timeout_second,
+            ):
+                player.queue.extend(videos)
+                self.playback.prefetch(player)
+                loaded += len(videos)
+
+                self.outbox.edit(
+                    message,
+                    self.make_playlist_embed(
+                        ctx,
+                        playlist,
+                        loaded,
+                        done=False,
+                        skipped=pages.skipped,
+                    ),
+                )
+        except PytubeFixError, TimeoutError:
+            pass
+        finally:
+            self.outbox.edit(
+                message,
+                self.make_playlist_embed(
+                    ctx,
+                    playlist,
+                    loaded,
+                    done=True,
+                    skipped=pages.skipped,
+                ),
+            )
+
+    async def add_collection(
+        self,
+        ctx: Context,
+        collection: msp.SpotifyCollection,
+    ) -> None:
+        player = self.players.get(mu.get_guild_id(ctx))
+
+        slots = asyncio.Semaphore(self.resolver.per_guild_limit)
+        matches = [
+            (track, self.loop.create_task(self.match_track(slots, track)))
+            for track in collection.tracks
+        ]
+        skipped: list[str] = []
+
+        loaded = 0
+        while matches and not loaded:
+            track, match = matches.pop(0)
+            if await self.queue_match(player, match):
+                loaded += 1
+            else:
+                skipped.append(track.title)
+
+        message = await self.outbox.respond(
+            ctx,
+            self.make_playlist_embed(
+                ctx,
+                collection,
+                loaded,
+                done=not matches,
+                skipped=skipped,
             ),
         )
 
-    async def idle_checker(self, guild_id: int, voice: VoiceClient) -> None:
-        await asyncio.sleep(self.timeout_second)
-        if self.cur_songs[guild_id] is None and not voice.is_playing():
-            await voice.disconnect()
+        self.start_loader(
+            player,
+            self.load_collection(ctx, message, collection, matches, skipped),
+        )
+
+    async def load_collection(
+        self,
+        ctx: Context,
+        message: discord.Message,
+        collection: msp.SpotifyCollection,
+        matches: list[tuple[msp.SpotifyTrack, Task[mq.QueueEntry]]],
+        skipped: list[str],
+    ) -> None:
+        player = self.players.get(mu.get_guild_id(ctx))
+        loaded = collection.length - len(matches) - len(skipped)
+        last_edit = time.monotonic()
 
-    def start_playing(self, guild_id: int, voice: VoiceClient) -> None:
-        cur_queue = self.song_queues[guild_id]
+        try:
+            for track, match in matches:
+                if await self.queue_match(player, match):
+                    loaded += 1
+                else:
+                    skipped.append(track.title)
 
-        if self.song_indexes[guild_id] + 1 >= len(cur_queue):
-            if not self.loop_queue[guild_id]:
-                self.cur_songs[guild_id] = None
+                if time.monotonic() - last_edit >= self.progress_edit_interval_second:
+                    last_edit = time.monotonic()
+                    self.outbox.edit(
+                        message,
+                        self.make_playlist_embed(
+                            ctx,
+                            collection,
+                            loaded,
+                            done=False,
+                            skipped=skipped,
+                        ),
+                    )
+        finally:
+            for _, match in matches:
+                match.cancel()
 
-                prev_task = self.idle_checkers[guild_id]
-                if prev_task and not prev_task.done():
-                    prev_task.cancel()
+            self.outbox.edit(
+                message,
+                self.make_playlist_embed(
+                    ctx,
+                    collection,
+                    loaded,
+                    done=True,
+                    skipped=skipped,
+                ),
+            )
 
-                self.idle_checkers[guild_id] = self.loop.create_task(
-                    self.idle_checker(guild_id, voice),
-                )
-                return
+    async def match_track(
+        self,
+        slots: asyncio.Semaphore,
+        track: msp.SpotifyTrack,
+    ) -> mq.QueueEntry:
+        async with slots:
+            return await self.resolver.run(
+                None,
+                self.metadata.match,
+                track.title,
+                track.duration,
+                key=f"match:{mm.match_key(track.title, track.duration)}",
+            )
+
+    async def queue_match(
+        self,
+        player: mgp.GuildPlayer,
+        match: Task[mq.QueueEntry],
+    ) -> bool:
+        try:
+            player.queue.append(await match)
+        except PytubeFixError, TimeoutError, IndexError:
+            return False
+
+        self.playback.prefetch(player)
+        return True
 
-            self.song_indexes[guild_id] = -1
+    def make_playlist_embed(
+        self,
+        ctx: Context,
+        playlist: mm.PlaylistInfo | msp.SpotifyCollection,
+        loaded: int,
+        *,
+        done: bool,
+        skipped: Sequence[str] = (),
+    ) -> discord.Embed:
+        progress = (
+            f"{loaded} songs added"
+            if done
+            else f"{loaded}/{playlist.length} songs added..."
+        )
 
-        self.song_indexes[guild_id] += 1
+        embed = mu.make_embed(
+            ctx=ctx,
+            title=f"🎶 {playlist.kind.title()} Queued: {playlist.title}",
+            description=f"**{progress}**",
+            embed_url=playlist.playlist_url,
+            thumbnail_url=playlist.thumbnail_url,
+        )
 
-        cur_song = cur_queue[self.song_indexes[guild_id]]
+        if skipped:
+            embed.add_field(
+                name=f"⚠️ {len(skipped)} songs skipped",
+                value=textwrap.shorten(
+                    ", ".join(skipped),
+                    width=EMBED_FIELD_VALUE_LIMIT,
+                    placeholder=" ...",
+                ),
+                inline=False,
+            )
 
-        self.cur_songs[guild_id] = cur_song
-        self.progress_time[guild_id] = time.monotonic()
-        self.pause_time[guild_id] = 0.0
-        song_streams = cur_song.streams
+        return embed
 
-        if song_audio := song_streams.get_audio_only(subtype="webm"):
-            codec = "copy"
-        else:
-            song_audio = song_streams.get_audio_only(subtype="mp4")
-            codec = "libopus"
+    def start_loader(
+        self,
+        player: mgp.GuildPlayer,
+        coro: Coroutine[None, None, None],
+    ) -> None:
+        loader = self.loop.create_task(coro)
+        player.loaders.add(loader)
+        loader.add_done_callback(player.loaders.discard)
 
-        if not song_audio:
-            self.start_playing(guild_id, voice)
-            return
+    def stop_playlist_loading(self, player: mgp.GuildPlayer) -> None:
+        for loader in player.loaders:
+            loader.cancel()
 
-        voice.play(
-            source=discord.FFmpegOpusAudio(
-                source=song_audio.url,
-                bitrate=voice.channel.bitrate // 1000,
-                codec=codec,
-                before_options="-reconnect 1 -reconnect_streamed 1 "
-                "-reconnect_delay_max 5 -nostdin",
-                options="-vn -sn -dn",
+    async def add_song(self, ctx: Context, song: mq.QueueEntry) -> None:
+        player = self.players.get(mu.get_guild_id(ctx))
+        player.queue.append(song)
+        self.playback.prefetch(player)
+
+        await self.outbox.notify(
+            ctx,
+            mu.make_embed(
+                ctx=ctx,
+                title=f"🎵 Queued - at position #{len(player.queue)}",
+                description=f"[{song.title}]({song.watch_url}) by "
+                f"[{song.author}]({song.channel_url}) "
+                f"`{mu.time_format(song.length)}`",
+                thumbnail_url=song.thumbnail_url,
             ),
-            after=lambda _: self.start_playing(guild_id, voice),
         )
+
+    def is_voice_connected(self, guild_id: int) -> bool:
+        guild = self.get_guild(guild_id)
+        return bool(guild and guild.voice_client)
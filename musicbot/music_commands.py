@@ -1,24 +1,39 @@
 import math
-import random
 import time
 from typing import TYPE_CHECKING, cast
 
-import aiohttp
 import discord
-from bs4 import BeautifulSoup
 from discord.ext import commands
 from discord.ext.commands import Cog, Context
-from pytubefix import Playlist, Search, YouTube
 
+import musicbot.queue_view as mqv
 import musicbot.utils as mu
 
 if TYPE_CHECKING:
     from .music_bot import MusicBot
 
+MAX_CHOICE_NAME_LENGTH = 100
+MAX_CROSSFADE_SECOND = 12
+
 
 class MusicCommands(Cog):
     def __init__(self, bot: MusicBot) -> None:
         self.bot = bot
+        self.command_started: dict[Context, float] = {}
+
+    async def cog_before_invoke(self, ctx: Context) -> None:
+        self.command_started[ctx] = time.perf_counter()
+
+    async def cog_after_invoke(self, ctx: Context) -> None:
+        if (started := self.command_started.pop(ctx, None)) is None:
+            return
+
+        self.bot.metrics.observe(
+            "musicbot_command_seconds",
+            time.perf_counter() - started,
+            command=ctx.command.qualified_name,
+            outcome="error" if ctx.command_failed else "ok",
+        )
 
     @commands.hybrid_command(description="Play a song or playlist from YouTube")
     @discord.app_commands.describe(song="The YouTube link or search query")
@@ -26,40 +41,37 @@ class MusicCommands(Cog):
     async def play(self, ctx: Context, *, song: str) -> None:
         await ctx.defer()
 
-        if playlist_match := mu.YOUTUBE_PLAYLIST_REGEX.fullmatch(song):
-            playlist_id = playlist_match.group("playlist_id")
-            playlist = Playlist(
-                f"https://www.youtube.com/playlist?list={playlist_id}",
+        try:
+            await self.bot.resolve_and_add(ctx, song)
+        except TimeoutError:
+            await self.bot.outbox.respond(
+                ctx,
+                mu.make_embed(
+                    ctx=ctx,
+                    title="⌛ Lookup timed out, try again!",
+                ),
             )
-            await self.bot.add_playlist(ctx, playlist)
 
-        elif youtube_match := mu.YOUTUBE_WATCH_REGEX.fullmatch(song):
-            song_id = youtube_match.group("youtube_id")
-
-            youtube_song = YouTube(
-                f"https://www.youtube.com/watch?v={song_id}",
-                "WEB_MUSIC",
+    @play.autocomplete("song")
+    async def song_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[str]]:
+        with self.bot.metrics.timed("musicbot_autocomplete_seconds"):
+            suggestions = await self.bot.suggestions.suggest(
+                interaction.guild_id or 0,
+                interaction.user.id,
+                current,
             )
 
-            await self.bot.add_song(ctx, youtube_song)
-
-        elif spotify_match := mu.SPOTIFY_REGEX.fullmatch(song):
-            async with (
-                aiohttp.ClientSession() as session,
-                session.get(
-                    f"https://open.spotify.com/track/{spotify_match.group('spotify_id')}",
-                ) as response,
-            ):
-                html = await response.text()
-                soup = BeautifulSoup(html, "html.parser")
-
-                title = soup.title.string.removesuffix(" | Spotify")
-
-                youtube_song = Search(title).videos[0]
-                await self.bot.add_song(ctx, youtube_song)
-        else:
-            youtube_song = Search(song).videos[0]
-            await self.bot.add_song(ctx, youtube_song)
+        return [
+            discord.app_commands.Choice(
+                name=f"{info.title} - {info.author}"[:MAX_CHOICE_NAME_LENGTH],
+                value=info.watch_url,
+            )
+            for info in suggestions
+        ]
 
     @commands.hybrid_command(
         description="Show the current music queue with page selector",
@@ -69,58 +81,34 @@ class MusicCommands(Cog):
     async def queue(self, ctx: Context, page_number: int | None = None) -> None:
         await ctx.defer()
 
-        guild_id = mu.get_guild_id(ctx)
-        now_playing = self.bot.cur_songs[guild_id]
-        queue = self.bot.song_queues[guild_id]
+        player = self.bot.players.peek(mu.get_guild_id(ctx))
 
-        if not now_playing and not queue:
-            await ctx.send(
-                embed=mu.make_embed(
+        if not player or (not player.current and not player.queue):
+            await self.bot.outbox.respond(
+                ctx,
+                mu.make_embed(
                     ctx=ctx,
                     title="⚠️ No song is currently playing.",
                 ),
             )
             return
 
-        embed = mu.make_embed(
-            ctx=ctx,
-            title="🎶 Chungus Queue",
-        )
-
-        if now_playing:
-            embed.add_field(
-                name="Now Playing",
-                value=(
-                    f"▶️ [{now_playing.title}]({now_playing.watch_url}) "
-                    f"`{mu.time_format(now_playing.length)}`"
-                ),
-                inline=False,
-            ).set_thumbnail(url=now_playing.thumbnail_url)
-
-        if queue:
-            cur_page_number, len_pages, cur_page = mu.get_queue_page(
-                queue=queue,
-                current_index=self.bot.song_indexes[guild_id],
-                page_number=page_number,
-            )
-
-            embed.add_field(
-                name=f"Queue Page {cur_page_number}/{len_pages}",
-                value=cur_page,
-                inline=False,
-            )
-
-        await ctx.send(
-            embed=embed,
+        view = mqv.QueueView(player, ctx)
+        view.message = await self.bot.outbox.respond(
+            ctx,
+            view.render(page_number),
+            view,
         )
 
     @commands.hybrid_command(description="Skip the current song")
     async def skip(self, ctx: Context) -> None:
+        player = self.bot.players.peek(mu.get_guild_id(ctx))
         if voice := cast("discord.VoiceClient", ctx.voice_client):
-            voice.stop()
+            self.bot.playback.stop_source(player, voice)
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title="👌 Skipped",
             ),
@@ -128,13 +116,13 @@ class MusicCommands(Cog):
 
     @commands.hybrid_command(description="Clear the queue")
     async def clear(self, ctx: Context) -> None:
-        guild_id = mu.get_guild_id(ctx)
-
-        self.bot.song_queues[guild_id].clear()
-        self.bot.song_indexes[guild_id] = -1
+        if player := self.bot.players.peek(mu.get_guild_id(ctx)):
+            self.bot.stop_playlist_loading(player)
+            player.clear()
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title="🧹 Queue cleared",
             ),
@@ -148,28 +136,64 @@ class MusicCommands(Cog):
     @mu.handle_index_errors
     async def jump(self, ctx: Context, *, song_position: str) -> None:
         song_index = int(song_position) - 1
-        guild_id = mu.get_guild_id(ctx)
+        player = self.bot.players.get(mu.get_guild_id(ctx))
 
-        song = self.bot.song_queues[guild_id][song_index]
-        self.bot.song_indexes[guild_id] = song_index - 1
+        song = player.jump(song_index)
 
         if voice := cast("discord.VoiceClient", ctx.voice_client):
-            voice.stop()
+            self.bot.playback.stop_source(player, voice)
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title=f"⏩ Jumped to song #{song_position}",
                 description=f"[{song.title}]({song.watch_url})",
             ),
         )
 
+    @commands.hybrid_command(description="Seek to a position in the current song")
+    @discord.app_commands.describe(
+        position="The position to seek to, like 1:30 or 90",
+    )
+    @mu.handle_index_errors
+    async def seek(self, ctx: Context, *, position: str) -> None:
+        offset = mu.parse_time(position)
+        player = self.bot.players.peek(mu.get_guild_id(ctx))
+        voice = cast("discord.VoiceClient", ctx.voice_client)
+
+        if not player or not (song := player.current) or not voice:
+            await self.bot.outbox.respond(
+                ctx,
+                mu.make_embed(
+                    ctx=ctx,
+                    title="⚠️ No song is currently playing.",
+                ),
+            )
+            return
+
+        if not 0 <= offset < song.length:
+            raise IndexError
+
+        player.seek(offset)
+        self.bot.playback.stop_source(player, voice)
+
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
+                ctx=ctx,
+                title=f"⏩ Seeked to {mu.time_format(offset)}",
+                description=f"[{song.title}]({song.watch_url})",
+            ),
+        )
+
     @commands.hybrid_command(description="Loop the queue")
     async def loop(self, ctx: Context) -> None:
-        self.bot.loop_queue[mu.get_guild_id(ctx)] = True
+        self.bot.players.get(mu.get_guild_id(ctx)).loop_queue = True
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title="🔁 Now looping the queue",
             ),
@@ -177,27 +201,49 @@ class MusicCommands(Cog):
 
     @commands.hybrid_command(description="Disable queue looping")
     async def unloop(self, ctx: Context) -> None:
-        self.bot.loop_queue[mu.get_guild_id(ctx)] = False
+        self.bot.players.get(mu.get_guild_id(ctx)).loop_queue = False
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title="🔁❌ Looping is now disabled",
             ),
         )
 
+    @commands.hybrid_command(description="Fade songs into each other")
+    @discord.app_commands.describe(
+        seconds="How long the fade lasts, 0 plays songs back to back",
+    )
+    @mu.handle_index_errors
+    async def crossfade(self, ctx: Context, *, seconds: str) -> None:
+        crossfade_second = float(seconds)
+        if not 0 <= crossfade_second <= MAX_CROSSFADE_SECOND:
+            raise IndexError
+
+        self.bot.players.get(mu.get_guild_id(ctx)).crossfade_second = crossfade_second
+
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
+                ctx=ctx,
+                title=f"🎚️ Crossfading songs over {crossfade_second:g}s"
+                if crossfade_second
+                else "🎚️ Crossfade is now disabled",
+            ),
+        )
+
     @commands.hybrid_command(description="Pause the current song")
     async def pause(self, ctx: Context) -> None:
         if voice := cast("discord.VoiceClient", ctx.voice_client):
             voice.pause()
 
-        guild_id = mu.get_guild_id(ctx)
-
-        if not self.bot.pause_time[guild_id]:
-            self.bot.pause_time[guild_id] = time.monotonic()
+        if player := self.bot.players.peek(mu.get_guild_id(ctx)):
+            self.bot.playback.pause(player)
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title="⏸️ Paused",
             ),
@@ -208,15 +254,12 @@ class MusicCommands(Cog):
         if voice := cast("discord.VoiceClient", ctx.voice_client):
             voice.resume()
 
-        guild_id = mu.get_guild_id(ctx)
+        if player := self.bot.players.peek(mu.get_guild_id(ctx)):
+            self.bot.playback.resume(player)
 
-        self.bot.progress_time[guild_id] += (
-            time.monotonic() - self.bot.pause_time[guild_id]
-        )
-        self.bot.pause_time[guild_id] = 0.0
-
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title="▶️ Resumed",
             ),
@@ -229,10 +272,23 @@ class MusicCommands(Cog):
     @mu.handle_index_errors
     async def remove(self, ctx: Context, *, song_position: str) -> None:
         song_index = int(song_position) - 1
-        song = self.bot.song_queues[mu.get_guild_id(ctx)].pop(song_index)
+        player = self.bot.players.peek(mu.get_guild_id(ctx))
+
+        if not player:
+            await self.bot.outbox.respond(
+                ctx,
+                mu.make_embed(
+                    ctx=ctx,
+                    title="⚠️ No song is currently playing.",
+                ),
+            )
+            return
+
+        song = player.queue.pop(song_index)
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title=f"🗑️ Removed song #{song_position}",
                 description=f"[{song.title}]({song.watch_url})",
@@ -241,10 +297,23 @@ class MusicCommands(Cog):
 
     @commands.hybrid_command(description="Shuffle the queue")
     async def shuffle(self, ctx: Context) -> None:
-        random.shuffle(self.bot.song_queues[mu.get_guild_id(ctx)])
+        player = self.bot.players.peek(mu.get_guild_id(ctx))
+
+        if not player:
+            await self.bot.outbox.respond(
+                ctx,
+                mu.make_embed(
+                    ctx=ctx,
+                    title="⚠️ No song is currently playing.",
+                ),
+            )
+            return
+
+        player.queue.shuffle()
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title="🔀 Queue shuffled",
             ),
@@ -252,15 +321,15 @@ class MusicCommands(Cog):
 
     @commands.hybrid_command(description="Stop playing and clear the queue")
     async def stop(self, ctx: Context) -> None:
-        guild_id = mu.get_guild_id(ctx)
-
-        self.bot.song_queues[guild_id].clear()
-        self.bot.song_indexes[guild_id] = -1
+        if player := self.bot.players.peek(mu.get_guild_id(ctx)):
+            self.bot.stop_playlist_loading(player)
+            player.clear()
         if voice := cast("discord.VoiceClient", ctx.voice_client):
-            voice.stop()
+            self.bot.playback.stop_source(player, voice)
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title="🛑 Stopped and cleared queue",
             ),
@@ -279,13 +348,24 @@ class MusicCommands(Cog):
     ) -> None:
         first_index = int(current_position) - 1
         second_index = int(new_position) - 1
-        song_queue = self.bot.song_queues[mu.get_guild_id(ctx)]
+        player = self.bot.players.peek(mu.get_guild_id(ctx))
 
-        song = song_queue.pop(first_index)
-        song_queue.insert(second_index, song)
+        if not player:
+            await self.bot.outbox.respond(
+                ctx,
+                mu.make_embed(
+                    ctx=ctx,
+                    title="⚠️ No song is currently playing.",
+                ),
+            )
+            return
+
+        song = player.queue.pop(first_index)
+        player.queue.insert(second_index, song)
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.notify(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title=f"↕️ Moved song #{current_position} to #{new_position}",
                 description=f"[{song.title}]({song.watch_url})",
@@ -294,26 +374,19 @@ class MusicCommands(Cog):
 
     @commands.hybrid_command(description="Show detailed info about the current song")
     async def info(self, ctx: Context) -> None:
-        guild_id = mu.get_guild_id(ctx)
+        player = self.bot.players.peek(mu.get_guild_id(ctx))
 
-        if not (now_playing := self.bot.cur_songs[guild_id]):
-            await ctx.send(
-                embed=mu.make_embed(
+        if not player or not (now_playing := player.current):
+            await self.bot.outbox.respond(
+                ctx,
+                mu.make_embed(
                     ctx=ctx,
                     title="⚠️ No song is currently playing.",
                 ),
             )
             return
 
-        progress = math.floor(
-            time.monotonic()
-            - self.bot.progress_time[guild_id]
-            - (
-                time.monotonic() - self.bot.pause_time[guild_id]
-                if self.bot.pause_time[guild_id]
-                else 0.0
-            ),
-        )
+        progress = math.floor(player.progress)
         total_length = now_playing.length or 0
 
         uploader = f"[{now_playing.author}]({now_playing.channel_url})"
@@ -322,10 +395,11 @@ class MusicCommands(Cog):
             progress=progress,
             total_length=total_length,
         )
-        loop_status = "🔁 Queue Looping" if self.bot.loop_queue[guild_id] else "No Loop"
+        loop_status = "🔁 Queue Looping" if player.loop_queue else "No Loop"
 
-        await ctx.send(
-            embed=mu.make_embed(
+        await self.bot.outbox.respond(
+            ctx,
+            mu.make_embed(
                 ctx=ctx,
                 title=now_playing.title,
                 description=(
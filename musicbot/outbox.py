@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import musicbot.utils as mu
+
+if TYPE_CHECKING:
+    import discord
+    from discord.ext.commands import Context
+
+MERGE_WINDOW_SECOND = 1.0
+STATUS_REUSE_SECOND = 30
+MAX_STATUS_LINES = 10
+MAX_LINE_LENGTH = 300
+
+DISCORD_HTTP_LOGGER = "discord.http"
+RATE_LIMITED_LOG_PREFIX = "We are being rate limited"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Response:
+    ctx: Context
+    embed: discord.Embed
+    view: discord.ui.View | None
+    future: asyncio.Future[discord.Message]
+
+
+@dataclass(slots=True)
+class Channel:
+    responses: deque[Response] = field(default_factory=deque)
+    edits: dict[int, tuple[discord.Message, discord.Embed]] = field(
+        default_factory=dict,
+    )
+    notices: list[tuple[Context, discord.Embed]] = field(default_factory=list)
+    notices_due: float = 0.0
+    last_notice_at: float = 0.0
+
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+    worker: asyncio.Task | None = None
+
+    status: discord.Message | None = None
+    status_lines: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.responses) + len(self.edits) + len(self.notices)
+
+
+def notice_line(embed: discord.Embed) -> str:
+    line = f"**{embed.title}**"
+    if embed.description:
+        line += f" - {embed.description}"
+    return line[:MAX_LINE_LENGTH]
+
+
+class Outbox:
+    def __init__(self, merge_window_second: float = MERGE_WINDOW_SECOND) -> None:
+        self.merge_window_second = merge_window_second
+        self.channels: dict[int, Channel] = {}
+        self.stats = Counter[str]()
+
+    @property
+    def queued(self) -> int:
+        return sum(len(channel) for channel in self.channels.values())
+
+    def start(self) -> None:
+        logging.getLogger(DISCORD_HTTP_LOGGER).addFilter(self.count_rate_limit)
+
+    def close(self) -> None:
+        logging.getLogger(DISCORD_HTTP_LOGGER).removeFilter(self.count_rate_limit)
+
+        for channel in self.channels.values():
+            for response in channel.responses:
+                response.future.cancel()
+            channel.responses.clear()
+
+            if channel.worker is not None:
+                channel.worker.cancel()
+
+    def count_rate_limit(self, record: logging.LogRecord) -> bool:
+        if str(record.msg).startswith(RATE_LIMITED_LOG_PREFIX):
+            self.stats["rate_limited"] += 1
+        return True
+
+    async def respond(
+        self,
+        ctx: Context,
+        embed: discord.Embed,
+        view: discord.ui.View | None = None,
+    ) -> discord.Message:
+        if ctx.interaction is not None:
+            self.stats["interaction"] += 1
+            return await self.send(ctx, embed, view)
+
+        future = asyncio.get_running_loop().create_future()
+        response = Response(ctx, embed, view, future)
+        channel = self.channels.setdefault(ctx.channel.id, Channel())
+        channel.responses.append(response)
+        self.wake(ctx.channel.id, channel)
+        return await future
+
+    async def notify(self, ctx: Context, embed: discord.Embed) -> None:
+        if ctx.interaction is not None:
+            await self.respond(ctx, embed)
+            return
+
+        channel = self.channels.setdefault(ctx.channel.id, Channel())
+        if not channel.notices:
+            channel.notices_due = max(
+                time.monotonic(),
+                channel.last_notice_at + self.merge_window_second,
+            )
+        channel.notices.append((ctx, embed))
+        self.wake(ctx.channel.id, channel)
+
+    def edit(self, message: discord.Message, embed: discord.Embed) -> None:
+        channel = self.channels.setdefault(message.channel.id, Channel())
+        if message.id in channel.edits:
+            self.stats["edit_coalesced"] += 1
+        channel.edits[message.id] = (message, embed)
+        self.wake(message.channel.id, channel)
+
+    def wake(self, channel_id: int, channel: Channel) -> None:
+        channel.wake.set()
+        if channel.worker is None:
+            channel.worker = asyncio.create_task(self.drain(channel_id, channel))
+
+    async def drain(self, channel_id: int, channel: Channel) -> None:
+        try:
+            while True:
+                channel.wake.clear()
+
+                if channel.responses:
+                    await self.deliver(channel.responses.popleft())
+                elif channel.edits:
+                    message, embed = channel.edits.pop(next(iter(channel.edits)))
+                    await self.apply_edit(message, embed)
+                elif channel.notices:
+                    if (delay := channel.notices_due - time.monotonic()) > 0:
+                        await self.sleep(channel, delay)
+                    else:
+                        await self.flush_notices(channel)
+                elif (linger := self.status_remaining(channel)) > 0:
+                    await self.sleep(channel, linger)
+                else:
+                    break
+        finally:
+            channel.worker = None
+            if not channel:
+                self.channels.pop(channel_id, None)
+
+    async def sleep(self, channel: Channel, delay: float) -> None:
+        with suppress(TimeoutError):
+            await asyncio.wait_for(channel.wake.wait(), delay)
+
+    def status_remaining(self, channel: Channel) -> float:
+        if channel.status is None:
+            return 0.0
+        return channel.last_notice_at + STATUS_REUSE_SECOND - time.monotonic()
+
+    async def send(
+        self,
+        ctx: Context,
+        embed: discord.Embed,
+        view: discord.ui.View | None = None,
+    ) -> discord.Message:
+        self.stats["sent"] += 1
+        if view is None:
+            return await ctx.send(embed=embed)
+        return await ctx.send(embed=embed, view=view)
+
+    async def deliver(self, response: Response) -> None:
+        try:
+            message = await self.send(response.ctx, response.embed, response.view)
+        except Exception as error:
+            logger.warning("Could not send a response", exc_info=True)
+            if not response.future.done():
+                response.future.set_exception(error)
+        else:
+            if not response.future.done():
+                response.future.set_result(message)
+        finally:
+            response.future.cancel()
+
+    async def apply_edit(self, message: discord.Message, embed: discord.Embed) -> None:
+        self.stats["edited"] += 1
+        try:
+            await message.edit(embed=embed)
+        except Exception:
+            logger.warning("Could not edit message %s", message.id, exc_info=True)
+
+    async def flush_notices(self, channel: Channel) -> None:
+        notices, channel.notices = channel.notices, []
+        ctx, embed = notices[-1]
+        lines = [notice_line(notice) for _, notice in notices]
+        command_ids = {notice_ctx.message.id for notice_ctx, _ in notices}
+
+        now = time.monotonic()
+        status = channel.status
+        if (
+            status is None
+            or now - channel.last_notice_at >= STATUS_REUSE_SECOND
+            or ctx.channel.last_message_id not in {status.id, *command_ids}
+        ):
+            status = None
+        else:
+            lines = [*channel.status_lines, *lines]
+
+        channel.status_lines = lines[-MAX_STATUS_LINES:]
+        channel.last_notice_at = now
+        self.stats["merged"] += len(notices) - 1
+
+        if status is not None or len(notices) > 1:
+            embed = self.status_embed(ctx, channel.status_lines)
+
+        if status is not None:
+            await self.apply_edit(status, embed)
+            return
+
+        try:
+            channel.status = await self.send(ctx, embed)
+        except Exception:
+            channel.status = None
+            logger.warning("Could not post %d notices", len(notices), exc_info=True)
+
+    def status_embed(self, ctx: Context, lines: list[str]) -> discord.Embed:
+        return mu.make_embed(
+            ctx=ctx,
+            title="📋 Latest updates",
+            description="\n".join(lines),
+        )
@@ -0,0 +1,440 @@
+import asyncio
+import functools
+import logging
+import time
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import discord
+
+import musicbot.deadlines as mdl
+import musicbot.gapless as mgl
+import musicbot.guild_player as mgp
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from discord import VoiceClient
+
+    from .music_bot import MusicBot
+    from .queue_entry import QueueEntry
+
+STREAM_END_TOLERANCE_SECOND = 10
+MAX_STREAM_RECOVERIES = 3
+PRELOAD_SECOND = 10
+FFMPEG_OPTIONS = "-vn -sn -dn"
+STREAM_BEFORE_OPTIONS = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+
+logger = logging.getLogger(__name__)
+
+
+def log_failure(future: Future[None]) -> None:
+    if not future.cancelled() and (error := future.exception()):
+        logger.error("Playback callback failed", exc_info=error)
+
+
+def ffmpeg_source(
+    source: str,
+    before_options: str,
+    bitrate: int,
+    codec: str | None,
+    *,
+    pcm: bool,
+) -> discord.AudioSource:
+    if pcm:
+        return discord.FFmpegPCMAudio(
+            source=source,
+            before_options=before_options,
+            options=FFMPEG_OPTIONS,
+        )
+
+    return discord.FFmpegOpusAudio(
+        source=source,
+        bitrate=bitrate,
+        codec=codec,
+        before_options=before_options,
+        options=FFMPEG_OPTIONS,
+    )
+
+
+class Preloader:
+    def __init__(
+        self,
+        playback: Playback,
+        preload_second: float = PRELOAD_SECOND,
+    ) -> None:
+        self.playback = playback
+        self.preload_second = preload_second
+        self.deadlines = mdl.DeadlineScheduler(self.preload)
+
+    def start(self) -> None:
+        self.deadlines.start()
+
+    def close(self) -> None:
+        self.deadlines.close()
+
+    def schedule(self, player: mgp.GuildPlayer) -> None:
+        song = player.current
+        if (
+            not self.preload_second
+            or not song
+            or not song.length
+            or player.state is mgp.PlayerState.PAUSED
+        ):
+            return
+
+        remaining = song.length - player.progress - player.crossfade_second
+        self.deadlines.schedule(
+            player.guild_id,
+            max(remaining - self.preload_second, 0.0),
+        )
+
+    async def preload(self, guild_id: int) -> None:
+        playback = self.playback
+        player = playback.bot.players.peek(guild_id)
+        if (
+            not player
+            or player.state is mgp.PlayerState.PAUSED
+            or not (entry := playback.chains.get(guild_id))
+        ):
+            return
+
+        chain, voice = entry
+        song = player.peek_next()
+        if (
+            song is None
+            or chain.song is not player.current
+            or chain.has_upcoming(song)
+            or chain.is_opus() == (player.crossfade_second > 0)
+        ):
+            return
+
+        cursor_version = player.cursor_version
+        is_next = functools.partial(self.is_next, player, song, cursor_version)
+        source = await playback.make_source(
+            player,
+            song,
+            voice,
+            pcm=not chain.is_opus(),
+        )
+        if source is None:
+            return
+
+        buffered = mgl.BufferedSource(source)
+        if (
+            not await asyncio.to_thread(buffered.fill)
+            or playback.chains.get(guild_id) is not entry
+            or not is_next()
+        ):
+            buffered.cleanup()
+            return
+
+        chain.set_upcoming(mgl.Upcoming(song, buffered, is_next))
+        playback.stats["preloaded"] += 1
+
+    def is_next(
+        self,
+        player: mgp.GuildPlayer,
+        song: QueueEntry,
+        cursor_version: int,
+    ) -> bool:
+        try:
+            return (
+                player.cursor_version == cursor_version
+                and player.peek_next() is song
+                and not player.ended_early(
+                    STREAM_END_TOLERANCE_SECOND + player.crossfade_second,
+                )
+            )
+        except IndexError:
+            return False
+
+    def take(
+        self,
+        player: mgp.GuildPlayer,
+        song: QueueEntry,
+        *,
+        pcm: bool,
+    ) -> discord.AudioSource | None:
+        entry = self.playback.chains.get(player.guild_id)
+        if not entry or not (source := entry[0].pop_upcoming(song)):
+            return None
+
+        if source.is_opus() == pcm:
+            source.cleanup()
+            return None
+
+        self.playback.stats["preloaded_reused"] += 1
+        return source
+
+    def cancel(self, player: mgp.GuildPlayer) -> None:
+        self.deadlines.cancel(player.guild_id)
+        if entry := self.playback.chains.get(player.guild_id):
+            entry[0].set_upcoming(None)
+
+
+class Playback:
+    def __init__(
+        self,
+        bot: MusicBot,
+        idle_timeout_second: float = 5 * 60,
+        preload_second: float = PRELOAD_SECOND,
+    ) -> None:
+        self.bot = bot
+        self.idle_timeout_second = idle_timeout_second
+        self.idle_timers = mdl.DeadlineScheduler(self.disconnect_idle)
+        self.preloader = Preloader(self, preload_second)
+        self.chains: dict[int, tuple[mgl.TrackChain, VoiceClient]] = {}
+        self.stats = Counter[str]()
+
+    def start(self) -> None:
+        self.idle_timers.start()
+        self.preloader.start()
+
+    def close(self) -> None:
+        self.idle_timers.close()
+        self.preloader.close()
+
+    def prefetch(self, player: mgp.GuildPlayer) -> None:
+        next_index = player.index + 1
+        upcoming = player.queue[next_index : next_index + self.bot.streams.lookahead]
+
+        if player.loop_queue:
+            upcoming += player.queue[: self.bot.streams.lookahead - len(upcoming)]
+
+        self.bot.streams.prefetch(player.guild_id, upcoming)
+        self.preloader.schedule(player)
+
+    async def disconnect_idle(self, guild_id: int) -> None:
+        player = self.bot.players.peek(guild_id)
+        guild = self.bot.get_guild(guild_id)
+
+        if (
+            player
+            and player.state is mgp.PlayerState.IDLE
+            and guild
+            and guild.voice_client
+        ):
+            await guild.voice_client.disconnect(force=False)
+
+    async def start_playing(self, guild_id: int, voice: VoiceClient) -> None:
+        player = self.bot.players.get(guild_id)
+        if player.state is mgp.PlayerState.IDLE:
+            await self.play_next(player, voice)
+
+    async def play_next(self, player: mgp.GuildPlayer, voice: VoiceClient) -> None:
+        player.state = mgp.PlayerState.LOADING
+
+        try:
+            if await self.start_next(player, voice):
+                return
+        except Exception:
+            logger.exception("Could not start the next song in %s", player.guild_id)
+
+        self.chains.pop(player.guild_id, None)
+        self.preloader.cancel(player)
+        player.current = None
+        player.state = mgp.PlayerState.IDLE
+        player.idle_since = time.monotonic()
+        self.idle_timers.schedule(player.guild_id, self.idle_timeout_second)
+
+    async def start_next(self, player: mgp.GuildPlayer, voice: VoiceClient) -> bool:
+        attempts = 0
+
+        while voice.is_connected() and attempts <= len(player.queue):
+            cursor_version = player.cursor_version
+            if not (song := player.advance()):
+                break
+
+            offset, player.resume_offset = player.resume_offset, 0.0
+            pcm = player.crossfade_second > 0
+
+            source = (
+                None if offset else self.preloader.take(player, song, pcm=pcm)
+            ) or await self.make_source(player, song, voice, offset, pcm=pcm)
+            if player.cursor_version != cursor_version:
+                if source:
+                    source.cleanup()
+                continue
+
+            if not source:
+                attempts += 1
+                continue
+
+            if not voice.is_connected():
+                source.cleanup()
+                return False
+
+            player.generation += 1
+            chain = mgl.TrackChain(
+                source,
+                song,
+                offset,
+                functools.partial(self.on_switch, player, voice, player.generation),
+                crossfade_second=player.crossfade_second,
+            )
+            self.chains[player.guild_id] = (chain, voice)
+
+            try:
+                voice.play(
+                    source=chain,
+                    after=functools.partial(
+                        self.on_track_end,
+                        player,
+                        voice,
+                        player.generation,
+                    ),
+                )
+            except discord.ClientException:
+                chain.cleanup()
+                raise
+
+            player.mark_started(offset)
+            self.idle_timers.cancel(player.guild_id)
+            self.prefetch(player)
+            return True
+
+        return False
+
+    def pause(self, player: mgp.GuildPlayer) -> None:
+        player.pause()
+        self.preloader.cancel(player)
+
+    def resume(self, player: mgp.GuildPlayer) -> None:
+        player.resume()
+        self.preloader.schedule(player)
+
+    def stop_source(self, player: mgp.GuildPlayer | None, voice: VoiceClient) -> None:
+        if player:
+            player.stop_requested = True
+        voice.stop()
+
+    def on_switch(
+        self,
+        player: mgp.GuildPlayer,
+        voice: VoiceClient,
+        generation: int,
+        song: QueueEntry,
+        gap_second: float,
+    ) -> None:
+        asyncio.run_coroutine_threadsafe(
+            self.switched(player, voice, generation, song, gap_second),
+            self.bot.loop,
+        ).add_done_callback(log_failure)
+
+    async def switched(
+        self,
+        player: mgp.GuildPlayer,
+        voice: VoiceClient,
+        generation: int,
+        song: QueueEntry,
+        gap_second: float,
+    ) -> None:
+        if generation != player.generation:
+            return
+
+        if player.peek_next() is not song:
+            self.stop_source(player, voice)
+            return
+
+        player.advance()
+        player.mark_started(0.0)
+        self.stats["gapless_switches"] += 1
+        self.prefetch(player)
+        self.bot.metrics.observe("musicbot_transition_gap_seconds", gap_second)
+
+    def on_track_end(
+        self,
+        player: mgp.GuildPlayer,
+        voice: VoiceClient,
+        generation: int,
+        _: Exception | None,
+    ) -> None:
+        asyncio.run_coroutine_threadsafe(
+            self.finish_track(player, voice, generation, time.perf_counter()),
+            self.bot.loop,
+        ).add_done_callback(log_failure)
+
+    async def finish_track(
+        self,
+        player: mgp.GuildPlayer,
+        voice: VoiceClient,
+        generation: int,
+        ended_at: float,
+    ) -> None:
+        if generation != player.generation or player.state not in {
+            mgp.PlayerState.PLAYING,
+            mgp.PlayerState.PAUSED,
+        }:
+            return
+
+        if voice.is_connected() and player.ended_early(STREAM_END_TOLERANCE_SECOND):
+            self.recover_stream(player)
+
+        await self.play_next(player, voice)
+
+        if player.state is mgp.PlayerState.PLAYING:
+            self.bot.metrics.observe(
+                "musicbot_transition_gap_seconds",
+                time.perf_counter() - ended_at,
+            )
+
+    def recover_stream(self, player: mgp.GuildPlayer) -> None:
+        self.stats["early_ends"] += 1
+
+        if player.recoveries >= MAX_STREAM_RECOVERIES:
+            self.stats["abandoned_recoveries"] += 1
+            return
+
+        song = player.current
+        offset = player.progress
+        logger.info(
+            "Stream for %s ended early at %.1fs of %ds, resuming",
+            song.video_id,
+            offset,
+            song.length,
+        )
+
+        player.recoveries += 1
+        self.stats["recoveries"] += 1
+        self.bot.streams.discard(song.video_id)
+        player.seek(offset)
+
+    async def make_source(
+        self,
+        player: mgp.GuildPlayer,
+        song: QueueEntry,
+        voice: VoiceClient,
+        offset: float = 0.0,
+        *,
+        pcm: bool = False,
+    ) -> discord.AudioSource | None:
+        audio_cache = self.bot.audio_cache
+        bitrate = voice.channel.bitrate // 1000
+        seek = f"-ss {offset:.3f} " if offset > 0 else ""
+
+        if audio_cache and (cached_path := audio_cache.get(song.video_id)):
+            return ffmpeg_source(
+                str(cached_path),
+                f"{seek}-nostdin",
+                bitrate,
+                "copy",
+                pcm=pcm,
+            )
+
+        with self.bot.metrics.timed("musicbot_stream_resolve_seconds"):
+            stream = await self.bot.streams.get(player.guild_id, song)
+
+        if not stream:
+            return None
+
+        if audio_cache:
+            audio_cache.schedule_fill(song, stream)
+
+        return ffmpeg_source(
+            stream.url,
+            f"{seek}{STREAM_BEFORE_OPTIONS} -nostdin",
+            bitrate,
+            stream.codec,
+            pcm=pcm,
+        )
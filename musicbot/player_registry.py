@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+import musicbot.guild_player as mgp
+import musicbot.sessions as msn
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class PlayerRegistry:
+    def __init__(
+        self,
+        is_connected: Callable[[int], bool],
+        idle_ttl_second: float = 30 * 60,
+        sweep_interval_second: float = 60,
+    ) -> None:
+        self.is_connected = is_connected
+        self.idle_ttl_second = idle_ttl_second
+        self.sweep_interval_second = sweep_interval_second
+
+        self.players: dict[int, mgp.GuildPlayer] = {}
+        self.snapshots: dict[int, str] = {}
+        self.evicted = 0
+        self.sweeper: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __iter__(self) -> Iterator[mgp.GuildPlayer]:
+        return iter(self.players.values())
+
+    def get(self, guild_id: int) -> mgp.GuildPlayer:
+        if (player := self.peek(guild_id)) is None:
+            player = self.players[guild_id] = mgp.GuildPlayer(guild_id)
+        return player
+
+    def peek(self, guild_id: int) -> mgp.GuildPlayer | None:
+        if guild_id in self.snapshots:
+            self.players[guild_id] = msn.restore(
+                guild_id,
+                self.snapshots.pop(guild_id),
+            )
+        return self.players.get(guild_id)
+
+    def is_evictable(self, player: mgp.GuildPlayer, now: float) -> bool:
+        return (
+            player.state is mgp.PlayerState.IDLE
+            and not player.loaders
+            and now - player.idle_since >= self.idle_ttl_second
+            and not self.is_connected(player.guild_id)
+        )
+
+    def evict(self, guild_id: int) -> None:
+        del self.players[guild_id]
+        self.evicted += 1
+
+    def evict_idle(self) -> None:
+        now = time.monotonic()
+        for guild_id, player in list(self.players.items()):
+            if self.is_evictable(player, now):
+                self.evict(guild_id)
+
+    def memory_usage(self) -> int:
+        return sum(player.memory_usage() for player in self)
+
+    def start(self) -> None:
+        self.sweeper = asyncio.create_task(self.sweep())
+
+    def close(self) -> None:
+        if self.sweeper:
+            self.sweeper.cancel()
+
+    async def sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval_second)
+            self.evict_idle()
+
+            logger.info(
+                "%d live guild players (%d active), %d songs queued, "
+                "~%d KiB of player state, %d players evicted",
+                len(self),
+                sum(player.state is not mgp.PlayerState.IDLE for player in self),
+                sum(len(player.queue) for player in self),
+                self.memory_usage() // 1024,
+                self.evicted,
+            )
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+from pytubefix import YouTube
+
+
+@dataclass(frozen=True, slots=True)
+class QueueEntry:
+    video_id: str
+    title: str
+    author: str
+    length: int
+    thumbnail_url: str
+    channel_url: str
+
+    @property
+    def watch_url(self) -> str:
+        return f"https://youtube.com/watch?v={self.video_id}"
+
+    @classmethod
+    def from_youtube(cls, song: YouTube) -> QueueEntry:
+        return cls(
+            video_id=song.video_id,
+            title=song.title,
+            author=song.author,
+            length=song.length,
+            thumbnail_url=song.thumbnail_url,
+            channel_url=song.channel_url,
+        )
+
+    def to_youtube(self) -> YouTube:
+        return YouTube(self.watch_url)
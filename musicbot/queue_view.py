@@ -0,0 +1,162 @@
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+import discord
+
+import musicbot.utils as mu
+
+if TYPE_CHECKING:
+    from discord.ext.commands import Context
+
+    from .guild_player import GuildPlayer
+
+QUEUE_VIEW_TIMEOUT_SECOND = 5 * 60
+
+
+class QueueView(discord.ui.View):
+    def __init__(self, player: GuildPlayer, ctx: Context) -> None:
+        super().__init__(timeout=QUEUE_VIEW_TIMEOUT_SECOND)
+        self.player = player
+        self.ctx = ctx
+
+        self.page_number = 0
+        self.len_pages = 0
+        self.message: discord.Message | None = None
+
+        self.queue_version = -1
+        self.embeds: dict[
+            tuple[int, str | None, int | None],
+            tuple[discord.Embed, int, int],
+        ] = {}
+
+    def render(self, page_number: int | None = None) -> discord.Embed:
+        queue = self.player.queue
+        current_index = self.player.index
+
+        if queue.version != self.queue_version:
+            self.queue_version = queue.version
+            self.embeds.clear()
+
+        current = self.player.current
+        key = (current_index, current.video_id if current else None, page_number)
+        if key not in self.embeds:
+            self.embeds[key] = self.make_queue_embed(current_index, page_number)
+
+        embed, self.page_number, self.len_pages = self.embeds[key]
+
+        self.previous_page.disabled = self.page_number <= 1
+        self.next_page.disabled = self.page_number >= self.len_pages
+        self.jump_to_page.disabled = self.len_pages <= 1
+
+        return embed
+
+    def make_queue_embed(
+        self,
+        current_index: int,
+        page_number: int | None,
+    ) -> tuple[discord.Embed, int, int]:
+        now_playing = self.player.current
+        queue = self.player.queue
+
+        embed = mu.make_embed(
+            ctx=self.ctx,
+            title="🎶 Chungus Queue",
+        )
+
+        if now_playing:
+            embed.add_field(
+                name="Now Playing",
+                value=(
+                    f"▶️ [{now_playing.title}]({now_playing.watch_url}) "
+                    f"`{mu.time_format(now_playing.length)}`"
+                ),
+                inline=False,
+            ).set_thumbnail(url=now_playing.thumbnail_url)
+
+        if not queue:
+            return embed, 0, 0
+
+        cur_page_number, len_pages, cur_page = queue.get_page(
+            current_index=current_index,
+            page_number=page_number,
+        )
+
+        embed.add_field(
+            name=f"Queue Page {cur_page_number}/{len_pages}",
+            value=cur_page,
+            inline=False,
+        )
+
+        return embed, cur_page_number, len_pages
+
+    async def show_page(
+        self,
+        interaction: discord.Interaction,
+        page_number: int,
+    ) -> None:
+        self.render()
+        page_number = min(max(page_number, 1), self.len_pages)
+
+        await interaction.response.edit_message(
+            embed=self.render(page_number or None),
+            view=self,
+        )
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(
+        self,
+        interaction: discord.Interaction,
+        _: discord.ui.Button,
+    ) -> None:
+        await self.show_page(interaction, self.page_number - 1)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(
+        self,
+        interaction: discord.Interaction,
+        _: discord.ui.Button,
+    ) -> None:
+        await self.show_page(interaction, self.page_number + 1)
+
+    @discord.ui.button(label="Jump to page", style=discord.ButtonStyle.primary)
+    async def jump_to_page(
+        self,
+        interaction: discord.Interaction,
+        _: discord.ui.Button,
+    ) -> None:
+        await interaction.response.send_modal(JumpModal(self))
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            if isinstance(item, discord.ui.Button):
+                item.disabled = True
+
+        if self.message:
+            with suppress(discord.HTTPException):
+                await self.message.edit(view=self)
+
+
+class JumpModal(discord.ui.Modal, title="Jump to page"):
+    page_number = discord.ui.TextInput(
+        label="Page number",
+        max_length=6,
+    )
+
+    def __init__(self, queue_view: QueueView) -> None:
+        super().__init__()
+        self.queue_view = queue_view
+
+    async def on_submit(self, interaction: discord.Interaction) -> None:
+        try:
+            page_number = int(self.page_number.value)
+        except ValueError:
+            await interaction.response.send_message(
+                embed=mu.make_embed(
+                    ctx=self.queue_view.ctx,
+                    title="❌ Provide a number!",
+                ),
+                ephemeral=True,
+            )
+            return
+
+        await self.queue_view.show_page(interaction, page_number)
@@ -0,0 +1,127 @@
+import asyncio
+import functools
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import discord
+
+import musicbot.lookups as mlk
+import musicbot.utils as mu
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from discord.ext.commands import Context
+
+
+class Resolver:
+    def __init__(
+        self,
+        throttle: mlk.Throttle,
+        max_workers: int = 8,
+        per_guild_limit: int = 2,
+        timeout_second: float = 30.0,
+    ) -> None:
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="resolver",
+        )
+        self.throttle = throttle
+        self.per_guild_limit = per_guild_limit
+        self.timeout_second = timeout_second
+
+        self.guild_slots = defaultdict[int, asyncio.Semaphore](
+            lambda: asyncio.Semaphore(self.per_guild_limit),
+        )
+        self.guild_waiters = defaultdict[int, int](int)
+        self.lookups = mlk.SingleFlight()
+
+    async def run[T](
+        self,
+        guild_id: int | None,
+        func: Callable[..., T],
+        *args: object,
+        expires_at: float | None = None,
+        timeout_second: float | None = None,
+        key: str | None = None,
+    ) -> T:
+        timeout = timeout_second or self.timeout_second
+        if expires_at is not None:
+            timeout = min(timeout, expires_at - time.monotonic())
+        if timeout <= 0:
+            raise TimeoutError
+
+        now = asyncio.get_running_loop().time()
+        if key is None:
+            return await self.execute(guild_id, now + timeout, func, *args)
+
+        async with asyncio.timeout(timeout):
+            return await self.lookups.run(
+                key,
+                functools.partial(
+                    self.execute,
+                    guild_id,
+                    now + self.timeout_second,
+                    func,
+                    *args,
+                ),
+            )
+
+    async def execute[T](
+        self,
+        guild_id: int | None,
+        deadline: float,
+        func: Callable[..., T],
+        *args: object,
+    ) -> T:
+        if guild_id is None:
+            async with asyncio.timeout_at(deadline):
+                return await self.call(func, *args)
+
+        self.guild_waiters[guild_id] += 1
+        try:
+            async with (
+                asyncio.timeout_at(deadline),
+                self.guild_slots[guild_id],
+            ):
+                return await self.call(func, *args)
+        finally:
+            self.guild_waiters[guild_id] -= 1
+            if not self.guild_waiters[guild_id]:
+                del self.guild_waiters[guild_id]
+                del self.guild_slots[guild_id]
+
+    async def call[T](self, func: Callable[..., T], *args: object) -> T:
+        await self.throttle.wait()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            functools.partial(func, *args),
+        )
+
+    async def resolve[T](
+        self,
+        ctx: Context,
+        func: Callable[..., T],
+        *args: object,
+        key: str | None = None,
+    ) -> T:
+        return await self.run(
+            mu.get_guild_id(ctx),
+            func,
+            *args,
+            expires_at=interaction_deadline(ctx.interaction),
+            key=key,
+        )
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def interaction_deadline(interaction: discord.Interaction | None) -> float | None:
+    if interaction is None:
+        return None
+
+    remaining = (interaction.expires_at - discord.utils.utcnow()).total_seconds()
+    return time.monotonic() + remaining
@@ -0,0 +1,95 @@
+import bisect
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .queue_entry import QueueEntry
+
+GRAM_LENGTH = 3
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + GRAM_LENGTH] for i in range(len(text) - GRAM_LENGTH + 1)}
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+
+        self.keys: list[str] = []
+        self.key_video_ids: list[str] = []
+        self.key_ids: dict[str, int] = {}
+        self.sorted_keys: list[tuple[str, int]] = []
+        self.postings = defaultdict[str, set[int]](set)
+        self.entries: dict[str, QueueEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, text: str, entry: QueueEntry) -> None:
+        if not (key := normalize_query(text)):
+            return
+
+        with self.lock:
+            self.entries[entry.video_id] = entry
+
+            if (key_id := self.key_ids.get(key)) is not None:
+                self.key_video_ids[key_id] = entry.video_id
+                return
+
+            key_id = self.key_ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.key_video_ids.append(entry.video_id)
+            bisect.insort(self.sorted_keys, (key, key_id))
+
+            for gram in trigrams(key):
+                self.postings[gram].add(key_id)
+
+    def query(self, text: str, limit: int) -> list[QueueEntry]:
+        query = normalize_query(text)
+        if not query:
+            return []
+
+        with self.lock:
+            ranked = sorted(
+                self.candidates(query),
+                key=lambda key_id: (
+                    not self.keys[key_id].startswith(query),
+                    f" {query}" not in f" {self.keys[key_id]}",
+                    len(self.keys[key_id]),
+                ),
+            )
+
+            results: dict[str, QueueEntry] = {}
+            for key_id in ranked:
+                video_id = self.key_video_ids[key_id]
+                results.setdefault(video_id, self.entries[video_id])
+                if len(results) >= limit:
+                    break
+
+        return list(results.values())
+
+    def candidates(self, query: str) -> Iterator[int]:
+        if len(query) < GRAM_LENGTH:
+            start = bisect.bisect_left(self.sorted_keys, (query,))
+            for index in range(start, len(self.sorted_keys)):
+                key, key_id = self.sorted_keys[index]
+                if not key.startswith(query):
+                    return
+                yield key_id
+            return
+
+        postings = sorted(
+            (self.postings.get(gram, set()) for gram in trigrams(query)),
+            key=len,
+        )
+        for key_id in set.intersection(*postings):
+            if query in self.keys[key_id]:
+                yield key_id
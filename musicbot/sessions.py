@@ -0,0 +1,205 @@
+import asyncio
+import functools
+import json
+import logging
+import operator
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from itertools import starmap
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import musicbot.guild_player as mgp
+from musicbot.queue_entry import QueueEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .player_registry import PlayerRegistry
+
+SESSION_MAX_AGE_SECOND = 24 * 60 * 60
+
+ENTRY_FIELDS = tuple(field.name for field in fields(QueueEntry))
+entry_values = operator.attrgetter(*ENTRY_FIELDS)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    guild_id: int
+    entries: tuple[QueueEntry, ...]
+    index: int
+    loop_queue: bool
+    crossfade_second: float
+    offset: float
+
+    @classmethod
+    def capture(cls, player: mgp.GuildPlayer) -> Snapshot:
+        playing = player.current is not None and player.state in {
+            mgp.PlayerState.PLAYING,
+            mgp.PlayerState.PAUSED,
+        }
+
+        return cls(
+            guild_id=player.guild_id,
+            entries=tuple(player.queue),
+            index=player.index - 1 if playing else player.index,
+            loop_queue=player.loop_queue,
+            crossfade_second=player.crossfade_second,
+            offset=player.progress if playing else 0.0,
+        )
+
+    def encode(self) -> str:
+        return json.dumps(
+            {
+                "entries": [entry_values(entry) for entry in self.entries],
+                "index": self.index,
+                "loop_queue": self.loop_queue,
+                "crossfade_second": self.crossfade_second,
+                "offset": self.offset,
+            },
+            separators=(",", ":"),
+        )
+
+
+def restore(guild_id: int, state: str) -> mgp.GuildPlayer:
+    saved = json.loads(state)
+
+    player = mgp.GuildPlayer(guild_id)
+    player.queue.extend(starmap(QueueEntry, saved["entries"]))
+    player.index = min(saved["index"], len(player.queue) - 1)
+    player.loop_queue = saved["loop_queue"]
+    player.crossfade_second = saved.get("crossfade_second", 0.0)
+    player.resume_offset = saved["offset"]
+    return player
+
+
+class SessionStore:
+    def __init__(
+        self,
+        path: str,
+        owns_guild: Callable[[int], bool] = lambda _: True,
+        interval_second: float = 60,
+    ) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.owns_guild = owns_guild
+        self.interval_second = interval_second
+        self.executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="sessions",
+        )
+
+        self.connection: sqlite3.Connection | None = None
+        self.fingerprints: dict[int, tuple[int, int, bool, float, int]] = {}
+        self.saver: asyncio.Task[None] | None = None
+
+    async def run[T](self, func: Callable[..., T], *args: object) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            functools.partial(func, *args),
+        )
+
+    async def start(self, players: PlayerRegistry) -> None:
+        players.snapshots = await self.run(self.load)
+        self.saver = asyncio.create_task(self.save_periodically(players))
+
+        logger.info("Loaded %d saved guild sessions", len(players.snapshots))
+
+    async def close(self, players: PlayerRegistry) -> None:
+        if self.saver:
+            self.saver.cancel()
+
+        await self.save(players)
+        await self.run(self.disconnect)
+        self.executor.shutdown()
+
+    async def save_periodically(self, players: PlayerRegistry) -> None:
+        while True:
+            await asyncio.sleep(self.interval_second)
+            await self.save(players)
+
+    async def save(self, players: PlayerRegistry) -> None:
+        snapshots = []
+
+        for player in players:
+            fingerprint = (
+                player.queue.version,
+                player.index,
+                player.loop_queue,
+                player.crossfade_second,
+                player.generation,
+            )
+            if (
+                player.state is mgp.PlayerState.IDLE
+                and self.fingerprints.get(player.guild_id) == fingerprint
+            ):
+                continue
+
+            self.fingerprints[player.guild_id] = fingerprint
+            snapshots.append(Snapshot.capture(player))
+
+        live_ids = {player.guild_id for player in players} | players.snapshots.keys()
+        for guild_id in self.fingerprints.keys() - live_ids:
+            del self.fingerprints[guild_id]
+
+        await self.run(self.write, snapshots, live_ids)
+
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "guild_id INTEGER PRIMARY KEY, state TEXT NOT NULL, "
+                "saved_at REAL NOT NULL)",
+            )
+        return self.connection
+
+    def disconnect(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def load(self) -> dict[int, str]:
+        return {
+            guild_id: state
+            for guild_id, state in self.connect().execute(
+                "SELECT guild_id, state FROM sessions WHERE saved_at > ?",
+                (time.time() - SESSION_MAX_AGE_SECOND,),
+            )
+            if self.owns_guild(guild_id)
+        }
+
+    def write(self, snapshots: list[Snapshot], live_ids: set[int]) -> None:
+        connection = self.connect()
+        now = time.time()
+
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            for snapshot in snapshots:
+                if snapshot.entries:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                        (snapshot.guild_id, snapshot.encode(), now),
+                    )
+                else:
+                    connection.execute(
+                        "DELETE FROM sessions WHERE guild_id = ?",
+                        (snapshot.guild_id,),
+                    )
+
+            saved_ids = {
+                guild_id
+                for (guild_id,) in connection.execute("SELECT guild_id FROM sessions")
+                if self.owns_guild(guild_id)
+            }
+            connection.executemany(
+                "DELETE FROM sessions WHERE guild_id = ?",
+                ((guild_id,) for guild_id in saved_ids - live_ids),
+            )
@@ -0,0 +1,154 @@
+import bisect
+import random
+import sys
+from dataclasses import astuple
+from typing import TYPE_CHECKING, overload
+
+import musicbot.utils as mu
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .queue_entry import QueueEntry
+
+EMBED_FIELD_VALUE_LIMIT = 1024
+
+
+class SongQueue:
+    def __init__(self, max_items: int = 10) -> None:
+        self.max_items = max_items
+
+        self.entries: list[QueueEntry] = []
+        self.body_lengths: list[int] = []
+        self.page_starts: list[int] = []
+        self.paged_until = 0
+        self.version = 0
+        self.entry_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    def __iter__(self) -> Iterator[QueueEntry]:
+        return iter(self.entries)
+
+    @overload
+    def __getitem__(self, index: int) -> QueueEntry: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[QueueEntry]: ...
+
+    def __getitem__(self, index: int | slice) -> QueueEntry | list[QueueEntry]:
+        return self.entries[index]
+
+    def append(self, song: QueueEntry) -> None:
+        self.extend((song,))
+
+    def extend(self, songs: Iterable[QueueEntry]) -> None:
+        self.invalidate(len(self.entries))
+        for song in songs:
+            self.entries.append(song)
+            self.body_lengths.append(len(line_body(song)))
+            self.entry_bytes += entry_size(song)
+
+    def insert(self, index: int, song: QueueEntry) -> None:
+        if index < 0:
+            index = max(len(self.entries) + index, 0)
+        index = min(index, len(self.entries))
+
+        self.invalidate(index)
+        self.entries.insert(index, song)
+        self.body_lengths.insert(index, len(line_body(song)))
+        self.entry_bytes += entry_size(song)
+
+    def pop(self, index: int = -1) -> QueueEntry:
+        song = self.entries.pop(index)
+        index %= len(self.entries) + 1
+        self.invalidate(index)
+        del self.body_lengths[index]
+        self.entry_bytes -= entry_size(song)
+        return song
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.body_lengths.clear()
+        self.entry_bytes = 0
+        self.invalidate(0)
+
+    def shuffle(self) -> None:
+        order = list(range(len(self.entries)))
+        random.shuffle(order)
+        self.entries = [self.entries[i] for i in order]
+        self.body_lengths = [self.body_lengths[i] for i in order]
+        self.invalidate(0)
+
+    def invalidate(self, index: int) -> None:
+        self.version += 1
+        del self.page_starts[bisect.bisect_right(self.page_starts, index - 1) :]
+        self.paged_until = self.page_starts[-1] if self.page_starts else 0
+        if self.page_starts:
+            self.page_starts.pop()
+
+    def update_pages(self) -> None:
+        start = self.paged_until
+        current_count = 0
+        current_sum = 0
+
+        for index in range(start, len(self.entries)):
+            line_length = self.body_lengths[index] + len(str(index + 1)) + 6
+            if (
+                current_count >= self.max_items
+                or current_sum + line_length > EMBED_FIELD_VALUE_LIMIT
+            ):
+                self.page_starts.append(start)
+                start = index
+                current_count = 0
+                current_sum = 0
+
+            current_count += 1
+            current_sum += line_length
+
+        if current_count:
+            self.page_starts.append(start)
+
+        self.paged_until = len(self.entries)
+
+    def get_page(
+        self,
+        current_index: int,
+        page_number: int | None = None,
+    ) -> tuple[int, int, str]:
+        if self.paged_until < len(self.entries):
+            self.update_pages()
+
+        if page_number is None:
+            if not -len(self.entries) <= current_index < len(self.entries):
+                raise IndexError
+            current_index %= len(self.entries)
+            cur_page_number = bisect.bisect_right(self.page_starts, current_index)
+        else:
+            cur_page_number = page_number
+
+        start = self.page_starts[cur_page_number - 1]
+        next_page_index = (cur_page_number - 1) % len(self.page_starts) + 1
+        end = (
+            self.page_starts[next_page_index]
+            if next_page_index < len(self.page_starts)
+            else len(self.entries)
+        )
+
+        cur_page = "\n".join(
+            f"**{i})** {line_body(song)}"
+            for i, song in enumerate(self.entries[start:end], start=start + 1)
+        )
+        return cur_page_number, len(self.page_starts), cur_page
+
+
+def entry_size(song: QueueEntry) -> int:
+    return sys.getsizeof(song) + sum(sys.getsizeof(value) for value in astuple(song))
+
+
+def line_body(song: QueueEntry) -> str:
+    return f"[{song.title}]({song.watch_url}) `{mu.time_format(song.length)}`"
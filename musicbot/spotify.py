@@ -0,0 +1,171 @@
+import asyncio
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+import musicbot.lookups as mlk
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+SPOTIFY_URL = "https://open.spotify.com"
+
+HTTP_POOL_SIZE = 32
+DNS_CACHE_TTL_SECOND = 5 * 60
+HTTP_TIMEOUT_SECOND = 15
+
+PAGE_CHUNK_SIZE = 16 * 1024
+PAGE_READ_LIMIT = 1024 * 1024
+
+TRACK_FETCH_CONCURRENCY = 8
+MAX_CACHED_PAGES = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class SpotifyTrack:
+    spotify_id: str
+    title: str
+    duration: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class SpotifyCollection:
+    kind: str
+    spotify_id: str
+    title: str
+    thumbnail_url: str | None
+    tracks: tuple[SpotifyTrack, ...]
+
+    @property
+    def length(self) -> int:
+        return len(self.tracks)
+
+    @property
+    def playlist_url(self) -> str:
+        return f"{SPOTIFY_URL}/{self.kind}/{self.spotify_id}"
+
+
+class SpotifyClient:
+    def __init__(self) -> None:
+        self.session: aiohttp.ClientSession | None = None
+        self.lookups = mlk.SingleFlight()
+
+        self.tracks = OrderedDict[str, SpotifyTrack]()
+        self.collections = OrderedDict[str, SpotifyCollection]()
+
+    async def start(self) -> None:
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_POOL_SIZE,
+                ttl_dns_cache=DNS_CACHE_TTL_SECOND,
+            ),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECOND),
+        )
+
+    async def close(self) -> None:
+        if self.session:
+            await self.session.close()
+
+    async def fetch_head(self, url: str) -> BeautifulSoup:
+        if self.session is None:
+            error_msg = "Spotify client is not started!"
+            raise RuntimeError(error_msg)
+
+        page = bytearray()
+
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+
+            async for chunk in response.content.iter_chunked(PAGE_CHUNK_SIZE):
+                search_start = max(len(page) - len(b"</head>"), 0)
+                page += chunk
+
+                if b"</head>" in page[search_start:] or len(page) >= PAGE_READ_LIMIT:
+                    break
+
+        return parse_head(page.decode(errors="ignore"))
+
+    async def track(self, spotify_id: str) -> SpotifyTrack:
+        if spotify_id in self.tracks:
+            self.tracks.move_to_end(spotify_id)
+            return self.tracks[spotify_id]
+
+        return await self.lookups.run(
+            f"track/{spotify_id}",
+            functools.partial(self.fetch_track, spotify_id),
+        )
+
+    async def fetch_track(self, spotify_id: str) -> SpotifyTrack:
+        head = await self.fetch_head(f"{SPOTIFY_URL}/track/{spotify_id}")
+        duration = meta_content(head, "music:duration")
+
+        track = SpotifyTrack(
+            spotify_id=spotify_id,
+            title=head.title.string.removesuffix(" | Spotify"),
+            duration=int(duration) if duration and duration.isdigit() else None,
+        )
+        remember(self.tracks, spotify_id, track)
+        return track
+
+    async def collection(self, kind: str, spotify_id: str) -> SpotifyCollection:
+        key = f"{kind}/{spotify_id}"
+        if key in self.collections:
+            self.collections.move_to_end(key)
+            return self.collections[key]
+
+        return await self.lookups.run(
+            key,
+            functools.partial(self.fetch_collection, kind, spotify_id),
+        )
+
+    async def fetch_collection(self, kind: str, spotify_id: str) -> SpotifyCollection:
+        key = f"{kind}/{spotify_id}"
+        head = await self.fetch_head(f"{SPOTIFY_URL}/{key}")
+        track_ids = [
+            tag["content"].rstrip("/").rsplit("/", 1)[-1]
+            for tag in head.find_all("meta", attrs={"name": "music:song"})
+        ]
+
+        fetch_slots = asyncio.Semaphore(TRACK_FETCH_CONCURRENCY)
+
+        async def fetch_track(track_id: str) -> SpotifyTrack:
+            async with fetch_slots:
+                return await self.track(track_id)
+
+        tracks = await asyncio.gather(
+            *(fetch_track(track_id) for track_id in dict.fromkeys(track_ids)),
+            return_exceptions=True,
+        )
+
+        collection = SpotifyCollection(
+            kind=kind,
+            spotify_id=spotify_id,
+            title=meta_content(head, "og:title") or head.title.string,
+            thumbnail_url=meta_content(head, "og:image"),
+            tracks=tuple(track for track in tracks if isinstance(track, SpotifyTrack)),
+        )
+        remember(self.collections, key, collection)
+        return collection
+
+
+def parse_head(page: str) -> BeautifulSoup:
+    from bs4 import BeautifulSoup  # ruff: ignore[import-outside-top-level]
+
+    return BeautifulSoup(page, "html.parser")
+
+
+def meta_content(head: BeautifulSoup, name: str) -> str | None:
+    tag = head.find("meta", attrs={"property": name}) or head.find(
+        "meta",
+        attrs={"name": name},
+    )
+    return str(tag["content"]) if tag else None
+
+
+def remember[T](cache: OrderedDict[str, T], key: str, value: T) -> None:
+    cache[key] = value
+    if len(cache) > MAX_CACHED_PAGES:
+        cache.popitem(last=False)
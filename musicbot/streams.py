@@ -0,0 +1,126 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+from pytubefix.exceptions import PytubeFixError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .lookups import Throttle
+    from .queue_entry import QueueEntry
+    from .resolver import Resolver
+
+STREAM_EXPIRY_MARGIN_SECOND = 10 * 60
+DEFAULT_STREAM_TTL_SECOND = 60 * 60
+
+
+@dataclass(frozen=True)
+class AudioStream:
+    url: str
+    codec: str
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+def stream_expiry(url: str) -> float:
+    now = time.time()
+    query = parse_qs(urlsplit(url).query)
+
+    try:
+        expire = float(query["expire"][0])
+    except KeyError, ValueError:
+        expire = now + DEFAULT_STREAM_TTL_SECOND
+
+    return time.monotonic() + expire - now - STREAM_EXPIRY_MARGIN_SECOND
+
+
+def resolve_stream(song: QueueEntry) -> AudioStream | None:
+    song_streams = song.to_youtube().streams
+
+    if song_audio := song_streams.get_audio_only(subtype="webm"):
+        codec = "copy"
+    else:
+        song_audio = song_streams.get_audio_only(subtype="mp4")
+        codec = "libopus"
+
+    if not song_audio:
+        return None
+
+    return AudioStream(
+        url=song_audio.url,
+        codec=codec,
+        expires_at=stream_expiry(song_audio.url),
+    )
+
+
+class StreamCache:
+    def __init__(
+        self,
+        resolver: Resolver,
+        throttle: Throttle,
+        lookahead: int = 3,
+    ) -> None:
+        self.resolver = resolver
+        self.throttle = throttle
+        self.lookahead = lookahead
+
+        self.streams: dict[str, AudioStream] = {}
+        self.pending: dict[str, asyncio.Task[None]] = {}
+
+    async def get(self, guild_id: int, song: QueueEntry) -> AudioStream | None:
+        if pending := self.pending.get(song.video_id):
+            await asyncio.wait({pending})
+
+        stream = self.streams.pop(song.video_id, None)
+        if stream and not stream.expired:
+            return stream
+
+        try:
+            return await self.resolve(guild_id, song)
+        except PytubeFixError, TimeoutError:
+            return None
+
+    async def resolve(self, guild_id: int, song: QueueEntry) -> AudioStream | None:
+        return await self.resolver.run(
+            guild_id,
+            self.resolve_throttled,
+            song,
+            key=f"stream:{song.video_id}",
+        )
+
+    def resolve_throttled(self, song: QueueEntry) -> AudioStream | None:
+        with self.throttle.guard():
+            return resolve_stream(song)
+
+    def discard(self, video_id: str) -> None:
+        self.streams.pop(video_id, None)
+
+    def prefetch(self, guild_id: int, songs: Iterable[QueueEntry]) -> None:
+        self.streams = {
+            video_id: stream
+            for video_id, stream in self.streams.items()
+            if not stream.expired
+        }
+
+        for song in songs:
+            if song.video_id in self.streams or song.video_id in self.pending:
+                continue
+
+            self.pending[song.video_id] = asyncio.create_task(
+                self.fetch(guild_id, song),
+            )
+
+    async def fetch(self, guild_id: int, song: QueueEntry) -> None:
+        try:
+            if stream := await self.resolve(guild_id, song):
+                self.streams[song.video_id] = stream
+        except PytubeFixError, TimeoutError:
+            pass
+        finally:
+            del self.pending[song.video_id]
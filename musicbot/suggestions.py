@@ -0,0 +1,78 @@
+import asyncio
+import itertools
+import time
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from pytubefix.exceptions import PytubeFixError
+
+from .search_index import normalize_query
+
+if TYPE_CHECKING:
+    from .metadata import MetadataCache
+    from .queue_entry import QueueEntry
+    from .resolver import Resolver
+
+AUTOCOMPLETE_DEADLINE_SECOND = 2.5
+DEBOUNCE_SECOND = 0.4
+LIVE_SEARCH_INTERVAL_SECOND = 0.5
+MIN_LIVE_QUERY_LENGTH = 3
+MAX_SUGGESTIONS = 25
+ENOUGH_LOCAL_SUGGESTIONS = 5
+
+
+class Suggestions:
+    def __init__(self, metadata: MetadataCache, resolver: Resolver) -> None:
+        self.metadata = metadata
+        self.resolver = resolver
+
+        self.sequence = itertools.count()
+        self.latest: dict[int, int] = {}
+        self.next_live_search = 0.0
+        self.stats = Counter[str]()
+
+    async def suggest(
+        self,
+        guild_id: int,
+        user_id: int,
+        text: str,
+    ) -> list[QueueEntry]:
+        deadline = time.monotonic() + AUTOCOMPLETE_DEADLINE_SECOND
+        local = self.metadata.index.query(text, MAX_SUGGESTIONS)
+
+        if (
+            len(local) >= ENOUGH_LOCAL_SUGGESTIONS
+            or len(normalize_query(text)) < MIN_LIVE_QUERY_LENGTH
+        ):
+            self.stats["local"] += 1
+            return local
+
+        sequence = self.latest[user_id] = next(self.sequence)
+        await asyncio.sleep(DEBOUNCE_SECOND)
+
+        if self.latest.get(user_id) != sequence:
+            self.stats["debounced"] += 1
+            return local
+        del self.latest[user_id]
+
+        now = time.monotonic()
+        if now < self.next_live_search:
+            self.stats["rate_limited"] += 1
+            return local
+        self.next_live_search = now + LIVE_SEARCH_INTERVAL_SECOND
+
+        try:
+            live = await self.resolver.run(
+                guild_id,
+                self.metadata.suggest,
+                text,
+                expires_at=deadline,
+                key=f"suggest:{normalize_query(text)}",
+            )
+        except PytubeFixError, TimeoutError:
+            self.stats["live_failed"] += 1
+            return local
+
+        self.stats["live"] += 1
+        merged = {info.video_id: info for info in (*local, *live)}
+        return list(merged.values())[:MAX_SUGGESTIONS]
@@ -0,0 +1,155 @@
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import signal
+import time
+from multiprocessing.connection import wait
+from typing import TYPE_CHECKING
+
+import aiohttp
+import discord
+
+from .music_bot import MusicBot
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+    from .config import BotConfig
+
+GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+STOP_TIMEOUT_SECOND = 30
+RESTART_DELAY_SECOND = 5
+MAX_RESTART_DELAY_SECOND = 5 * 60
+STABLE_RUN_SECOND = 10 * 60
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(config: BotConfig, token: str) -> None:
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    MusicBot(config).run(token)
+
+
+async def fetch_shard_count(token: str) -> int:
+    async with (
+        aiohttp.ClientSession() as session,
+        session.get(GATEWAY_URL, headers={"Authorization": f"Bot {token}"}) as response,
+    ):
+        response.raise_for_status()
+        return (await response.json())["shards"]
+
+
+class Supervisor:
+    def __init__(self, config: BotConfig, token: str) -> None:
+        self.config = config
+        self.token = token
+        self.context = multiprocessing.get_context("spawn")
+
+        self.workers: dict[int, BaseProcess] = {}
+        self.started_at: dict[int, float] = {}
+        self.restarts: dict[int, int] = {}
+
+    def worker_config(
+        self,
+        index: int,
+        shard_count: int,
+        process_count: int,
+    ) -> BotConfig:
+        metrics_address = self.config.metrics_address
+        if metrics_address:
+            host, _, port = metrics_address.rpartition(":")
+            metrics_address = f"{host}:{int(port) + index}"
+
+        return dataclasses.replace(
+            self.config,
+            shard_count=shard_count,
+            shard_ids=tuple(range(index, shard_count, process_count)),
+            process_count=1,
+            metrics_address=metrics_address,
+        )
+
+    def run(self) -> None:
+        discord.utils.setup_logging()
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        shard_count = self.config.shard_count or asyncio.run(
+            fetch_shard_count(self.token),
+        )
+        process_count = min(self.config.process_count, shard_count)
+        configs = [
+            self.worker_config(index, shard_count, process_count)
+            for index in range(process_count)
+        ]
+
+        logger.info(
+            "Running %d shards across %d worker processes",
+            shard_count,
+            process_count,
+        )
+
+        try:
+            for index, config in enumerate(configs):
+                self.start_worker(index, config)
+
+            while True:
+                wait([worker.sentinel for worker in self.workers.values()])
+                for index, worker in list(self.workers.items()):
+                    if not worker.is_alive():
+                        self.restart_worker(index, configs[index], worker.exitcode)
+        except KeyboardInterrupt:
+            logger.info("Stopping worker processes")
+        finally:
+            self.stop()
+
+    def start_worker(self, index: int, config: BotConfig) -> None:
+        worker = self.context.Process(
+            target=run_worker,
+            args=(config, self.token),
+            name=f"musicbot-worker-{index}",
+        )
+        worker.start()
+
+        self.workers[index] = worker
+        self.started_at[index] = time.monotonic()
+
+        logger.info(
+            "Started worker %d (pid %d) for shards %s",
+            index,
+            worker.pid,
+            config.shard_ids,
+        )
+
+    def restart_worker(
+        self,
+        index: int,
+        config: BotConfig,
+        exit_code: int | None,
+    ) -> None:
+        if time.monotonic() - self.started_at[index] >= STABLE_RUN_SECOND:
+            self.restarts[index] = 0
+
+        delay = min(
+            RESTART_DELAY_SECOND * 2 ** self.restarts.get(index, 0),
+            MAX_RESTART_DELAY_SECOND,
+        )
+        self.restarts[index] = self.restarts.get(index, 0) + 1
+
+        logger.warning(
+            "Worker %d exited with code %s, restarting in %ds",
+            index,
+            exit_code,
+            delay,
+        )
+        time.sleep(delay)
+        self.start_worker(index, config)
+
+    def stop(self) -> None:
+        for worker in self.workers.values():
+            if worker.is_alive():
+                worker.terminate()
+
+        for worker in self.workers.values():
+            worker.join(STOP_TIMEOUT_SECOND)
+            if worker.is_alive():
+                worker.kill()
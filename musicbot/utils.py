@@ -1,5 +1,4 @@
 import functools
-import re
 import time
 from typing import TYPE_CHECKING, cast
 
@@ -12,22 +11,6 @@ if TYPE_CHECKING:
 
     from .music_commands import MusicCommands
 
-SPOTIFY_REGEX = re.compile(
-    r"https?:\/\/open\.spotify\.com\/track\/(?P<spotify_id>[A-Za-z0-9]{22})(\?.*)?",
-)
-
-YOUTUBE_PLAYLIST_REGEX = re.compile(
-    r"(?:http?s?://)?(?:www\.|m\.)?(?:music.)?youtu\.?be(?:\.com)?"
-    r"(?:\w*.?://)?\w*.?\w*-?.?\w*(?:playlist|list|embed|.*/)?\??"
-    r"(?:feature=\w*\.?\w*)?&?(?:list=|/)(?P<playlist_id>[\w-]{34,})(?:\S+)?",
-)
-
-YOUTUBE_WATCH_REGEX = re.compile(
-    r"(?:http?s?://)?(?:www\.|m\.)?(?:music.)?youtu\.?be(?:\.com)?"
-    r"(?:\w*.?://)?\w*.?\w*-?.?\w*(?:embed|e|v|watch|shorts|.*/)?\??"
-    r"(?:feature=\w*\.?\w*)?&?(?:\?v=|/)(?P<youtube_id>[\w-]{11})(?:\S+)?",
-)
-
 CHUNGUS_ICON = (
     "https://www.pngall.com/wp-content/uploads/15/Big-Chungus-PNG-Picture.png"
 )
@@ -40,57 +23,18 @@ def time_format(secs: int) -> str:
     return time.strftime("%M:%S", t)
 
 
+def parse_time(text: str) -> int:
+    secs = 0
+    for part in text.strip().split(":"):
+        secs = secs * 60 + int(part)
+    return secs
+
+
 def create_progress_bar(progress: int, total_length: int, bar_length: int = 20) -> str:
     filled_length = int(progress / total_length * bar_length) if total_length else 0
     return "█" * filled_length + "─" * (bar_length - filled_length)
 
 
-def get_queue_page(
-    queue: list,
-    current_index: int,
-    page_number: int | None = None,
-    max_items: int = 10,
-) -> tuple[int, int, str]:
-    embed_field_value_limit = 1024
-
-    lines = [
-        f"**{i})** [{s.title}]({s.watch_url}) `{time_format(s.length)}`"
-        for i, s in enumerate(queue, start=1)
-    ]
-
-    pages: list[list[str]] = []
-    current_page: list[str] = []
-    current_sum = 0
-
-    for line in lines:
-        line_length = len(line)
-        if (
-            len(current_page) >= max_items
-            or current_sum + line_length > embed_field_value_limit
-        ):
-            pages.append(current_page)
-            current_page = []
-            current_sum = 0
-
-        current_page.append(line)
-        current_sum += line_length
-
-    if current_page:
-        pages.append(current_page)
-
-    if page_number is None:
-        cur_page_number, cur_page = next(
-            (idx, page)
-            for idx, page in enumerate(pages, start=1)
-            if lines[current_index] in page
-        )
-    else:
-        cur_page_number = page_number
-        cur_page = pages[page_number - 1]
-
-    return cur_page_number, len(pages), "\n".join(cur_page)
-
-
 def make_embed(
     ctx: Context,
     title: str,
@@ -125,15 +69,17 @@ def handle_index_errors(
         try:
             await func(music_commands, ctx, *args, **kwargs)
         except ValueError:
-            await ctx.send(
-                embed=make_embed(
+            await music_commands.bot.outbox.respond(
+                ctx,
+                make_embed(
                     ctx=ctx,
                     title="❌ Provide a number!",
                 ),
             )
         except IndexError:
-            await ctx.send(
-                embed=make_embed(
+            await music_commands.bot.outbox.respond(
+                ctx,
+                make_embed(
                     ctx=ctx,
                     title="❌ Number is out of range!",
                 ),
@@ -155,8 +101,9 @@ def handle_voice_channel_join(
         author = cast("discord.Member", ctx.author)
 
         if author.voice is None or author.voice.channel is None:
-            await ctx.send(
-                embed=make_embed(
+            await music_commands.bot.outbox.respond(
+                ctx,
+                make_embed(
                     ctx=ctx,
                     title="🔊 Join a voice channel!",
                 ),
@@ -170,8 +117,7 @@ def handle_voice_channel_join(
 
         await func(music_commands, ctx, *args, **kwargs)
 
-        if not voice.is_playing():
-            music_commands.bot.start_playing(get_guild_id(ctx), voice)
+        await music_commands.bot.playback.start_playing(get_guild_id(ctx), voice)
 
     return wrapper
 